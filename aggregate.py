@@ -0,0 +1,78 @@
+from statistics import NormalDist
+
+import numpy as np
+
+
+def group_by(table, keys):
+    """
+    :param table:  dictionary of column name to array of the values of every run, see results.load_results
+    :param keys:  names of the columns to group the runs by
+    :return:  (groups, index) dictionary of the key columns to the key values of every group, in sorted order, and the
+              group of every run
+    """
+    columns = [np.ma.getdata(table[key]) for key in keys]
+    # sort the runs by their keys, a new group starts wherever a key changes
+    order = np.lexsort(columns[::-1])
+    starts = np.zeros(len(order), dtype=bool)
+    starts[:1] = True
+    for column in columns:
+        starts[1:] |= column[order][1:] != column[order][:-1]
+    index = np.empty(len(order), dtype=np.int64)
+    index[order] = np.cumsum(starts) - 1
+    groups = {key: column[order][starts] for key, column in zip(keys, columns)}
+    return groups, index
+
+
+def grouped_stats(table, keys, values, confidence=0.95):
+    """
+    compute the mean, median and confidence interval of the mean of columns over every group of runs. a run with no
+    value, like a milestone it never reached, is left out of the stats of that column and counted in its 'reached'
+    share instead of being taken as generation 0.
+    :param table:  dictionary of column name to array of the values of every run, see results.load_results
+    :param keys:  names of the columns to group the runs by
+    :param values:  names of the numeric columns to compute the stats of
+    :param confidence:  confidence level of the interval, from a normal approximation of the mean
+    :return:  dictionary of the key columns and, for every column of values, '<column> mean', '<column> median',
+              '<column> low', '<column> high', '<column> count' and '<column> reached' to an array with an entry per
+              group, NaN where a group has no value
+    """
+    groups, index = group_by(table, keys)
+    count = len(next(iter(groups.values())))
+    runs = np.bincount(index, minlength=count)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    result = dict(groups)
+    result['runs'] = runs
+    for name in values:
+        column = np.ma.masked_invalid(np.ma.asarray(table[name], dtype=np.float64))
+        present = ~np.ma.getmaskarray(column)
+        data = np.ma.getdata(column)[present]
+        group = index[present]
+        n = np.bincount(group, minlength=count)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.bincount(group, weights=data, minlength=count) / n
+            variance = np.bincount(group, weights=(data - mean[group]) ** 2, minlength=count) / (n - 1)
+            margin = z * np.sqrt(variance / n)
+        result[name + ' mean'] = mean
+        result[name + ' median'] = grouped_median(group, data, n)
+        result[name + ' low'] = mean - margin
+        result[name + ' high'] = mean + margin
+        result[name + ' count'] = n
+        result[name + ' reached'] = n / runs
+    return result
+
+
+def grouped_median(group, data, n):
+    """
+    :param group:  group of every value
+    :param data:  the values
+    :param n:  number of values of every group
+    :return:  median of the values of every group, NaN for a group with none
+    """
+    ordered = data[np.lexsort((data, group))]
+    starts = np.concatenate([[0], np.cumsum(n)[:-1]])
+    median = np.full(len(n), np.nan)
+    has = n > 0
+    low = ordered[starts[has] + (n[has] - 1) // 2]
+    high = ordered[starts[has] + n[has] // 2]
+    median[has] = (low + high) / 2
+    return median
@@ -0,0 +1,124 @@
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from engine import VectorEngine
+from kernels import HAVE_NUMBA
+from people import PersonRecords
+from simulation import SUSPICION_LEVELS, Grid, Person, Simulation
+
+
+def measure(build):
+    """
+    measure the memory that stays allocated after calling build
+    :param build:  function that builds and returns the measured object
+    :return:  the object and the number of bytes it holds on to
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+class DictPerson:
+    """
+    the Person of the original code, with a __dict__ per person instead of __slots__, to measure what the slots save
+    """
+
+    def __init__(self, i, j, L):
+        self.__i = i
+        self.__j = j
+        self.__L = L
+        self.rumor_spreader = False
+        self.rumor_received = False
+        self.heard_rumor = False
+        self.rumor_spread = False
+        self.__sum_of_suspicion = 0
+        self.__suspicion = 0
+        self.generation = 0
+
+    def set_suspicion(self, suspicion_level):
+        self.__suspicion = SUSPICION_LEVELS[suspicion_level]
+
+
+def build_people(person_class, grid):
+    """
+    :param person_class:  Person or DictPerson
+    :param grid:  Grid to create a person of every person of
+    :return:  list of the people, created like Grid.create_people creates them
+    """
+    people = []
+    for (i, j), group in zip(grid.people_coords, grid.groups.tolist()):
+        person = person_class(i, j, grid.L)
+        person.set_suspicion(group)
+        people.append(person)
+    return people
+
+
+def memory_per_agent(n=300, p=1, L=3):
+    """
+    print the memory per person of every representation of the population
+    :param n:  size of grid
+    :param p:  population density
+    :param L:  L parameter
+    """
+    rng = np.random.default_rng(0)
+    grid = build_grid(n, p, L, rng)
+    population = len(grid.people_coords)
+    # both kinds of Person are measured as a list of the people, with a pointer per person on top of the objects
+    _, dict_bytes = measure(lambda: build_people(DictPerson, grid))
+    _, slots_bytes = measure(lambda: build_people(Person, grid))
+    people, records_bytes = measure(lambda: PersonRecords.from_grid(grid))
+    engine, engine_bytes = measure(lambda: VectorEngine.from_grid(grid, L))
+
+    print("population: " + str(population))
+    print("Person with __dict__:  " + str(round(dict_bytes / population, 1)) + " bytes per person")
+    print("Person with __slots__: " + str(round(slots_bytes / population, 1)) + " bytes per person")
+    print("PersonRecords:         " + str(round(records_bytes / population, 1)) + " bytes per person (" +
+          str(people.records.itemsize) + " per record)")
+    print("VectorEngine:          " + str(round(engine_bytes / population, 1)) + " bytes per person (both buffers and "
+          "scratch arrays)")
+    return engine
+
+
+def engine_speed(sizes=(100, 500, 2000), engines=("object", "vector", "compiled"), generations=10, p=0.8, L=3):
+    """
+    print the time a generation takes with every engine on grids of every size
+    :param sizes:  sizes of grid
+    :param engines:  engines to compare, see Simulation
+    :param generations:  number of generations to time
+    :param p:  population density
+    :param L:  L parameter
+    """
+    if not HAVE_NUMBA:
+        print("numba is not installed, the compiled engine steps with the array operations of the vector engine")
+    # compile the kernel before timing it
+    Simulation([10, p, 0.3, 0.3, 0.2, L, 1], engine="compiled", seed=0).run()
+    for n in sizes:
+        for engine in engines:
+            simulation = Simulation([n, p, 0.3, 0.3, 0.2, L, generations], engine=engine, seed=0)
+            simulation.spread_rumor()
+            start = time.perf_counter()
+            for _ in range(generations):
+                simulation.next_generation()
+            seconds = (time.perf_counter() - start) / generations
+            print(str(n) + "x" + str(n) + " " + engine + ": " + str(round(seconds * 1000, 2)) + " ms per generation")
+
+
+def build_grid(n, p, L, rng=None):
+    grid = Grid(n, p, 0.3, 0.3, 0.2, rng)
+    grid.create_grid(L)
+    grid.create_rumor_spreader()
+    return grid
+
+
+if __name__ == "__main__":
+    # python benchmark.py [n] for the memory per person, python benchmark.py speed [sizes] for the engine speeds
+    if len(sys.argv) > 1 and sys.argv[1] == "speed":
+        engine_speed([int(size) for size in sys.argv[2:]] or (100, 500, 2000))
+    else:
+        memory_per_agent(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
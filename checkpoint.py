@@ -0,0 +1,98 @@
+import json
+import os
+
+import numpy as np
+
+# file with the generation, random generator state and slot of the last checkpoint of a directory
+META_FILE = 'checkpoint.json'
+
+
+def read_meta(directory):
+    """
+    :param directory:  checkpoint directory
+    :return:  the metadata of the last checkpoint in the directory, None if there is none
+    """
+    path = os.path.join(directory, META_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_checkpoint(engine, directory, extra=None):
+    """
+    write the state arrays of an engine into memory-mapped .npy files, and its generation and random generator state
+    into checkpoint.json. the arrays go to one of two slots in turn and checkpoint.json is replaced last, so a run
+    killed while writing a checkpoint still has the previous one. the files of a slot are reused, so a checkpoint
+    writes the arrays in place without allocating anything.
+    :param engine:  array engine to checkpoint
+    :param directory:  checkpoint directory
+    :param extra:  JSON serializable state of the caller to keep with the checkpoint
+    """
+    previous = read_meta(directory)
+    slot = 0 if previous is None else 1 - previous['slot']
+    slot_directory = os.path.join(directory, 'slot_' + str(slot))
+    os.makedirs(slot_directory, exist_ok=True)
+    for name in engine.CHECKPOINT_FIELDS:
+        array = getattr(engine, name)
+        path = os.path.join(slot_directory, name + '.npy')
+        stored = None
+        if os.path.exists(path):
+            stored = np.lib.format.open_memmap(path, mode='r+')
+            if stored.shape != array.shape or stored.dtype != array.dtype:
+                stored = None
+        if stored is None:
+            stored = np.lib.format.open_memmap(path, mode='w+', dtype=array.dtype, shape=array.shape)
+        stored[...] = array
+        stored.flush()
+        del stored
+    meta = {'slot': slot,
+            'engine': type(engine).__name__,
+            'generation': engine.generation,
+            'rng': [rng.bit_generator.state for rng in engine.generators()],
+            'extra': extra}
+    temporary = os.path.join(directory, META_FILE + '.tmp')
+    with open(temporary, 'w') as file:
+        json.dump(meta, file)
+    os.replace(temporary, os.path.join(directory, META_FILE))
+
+
+def load_checkpoint(directory, mmap_mode='r'):
+    """
+    open the last checkpoint of a directory, the arrays are memory-mapped so a generation of a large grid can be
+    inspected without reading all of it
+    :param directory:  checkpoint directory
+    :param mmap_mode:  mode to map the arrays with, see numpy.load
+    :return:  (arrays, meta) dictionary of the state arrays by name and the metadata of the checkpoint
+    """
+    meta = read_meta(directory)
+    if meta is None:
+        raise FileNotFoundError("no checkpoint in " + directory)
+    slot_directory = os.path.join(directory, 'slot_' + str(meta['slot']))
+    arrays = {name[:-len('.npy')]: np.load(os.path.join(slot_directory, name), mmap_mode=mmap_mode)
+              for name in os.listdir(slot_directory) if name.endswith('.npy')}
+    return arrays, meta
+
+
+def restore_checkpoint(engine, directory):
+    """
+    restore the state of an engine from the last checkpoint of a directory, the engine must be built from the same
+    parameters as the one that was checkpointed
+    :param engine:  array engine to restore
+    :param directory:  checkpoint directory
+    :return:  the extra state saved with the checkpoint
+    """
+    arrays, meta = load_checkpoint(directory)
+    if meta['engine'] != type(engine).__name__:
+        raise ValueError("checkpoint of a " + meta['engine'] + " can't be restored into a " + type(engine).__name__)
+    for name in engine.CHECKPOINT_FIELDS:
+        current = getattr(engine, name)
+        if arrays[name].shape != current.shape:
+            raise ValueError("checkpoint of " + name + " has shape " + str(arrays[name].shape) + ", not " +
+                             str(current.shape))
+        current[...] = arrays[name]
+    for rng, state in zip(engine.generators(), meta['rng']):
+        rng.bit_generator.state = state
+    engine.generation = meta['generation']
+    engine.count_state()
+    return meta['extra']
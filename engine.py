@@ -0,0 +1,809 @@
+import numpy as np
+
+from kernels import compiled_kernel
+from people import PersonRecords
+
+# the 8 cell moore neighborhood as (row, column) offsets
+MOORE_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+# Simulation.generation() calls Person.spread on the people in the order of people_coords, so a rumor coming from a
+# neighbor processed earlier reaches a person before their own spread() resets them, while a rumor from a neighbor
+# processed later reaches them after it. create_grid fills people_coords in row-major order.
+ROW_MAJOR_EARLIER = tuple(di < 0 or (di == 0 and dj < 0) for di, dj in MOORE_OFFSETS)
+# the arrays that change from one generation to the next
+STATE_FIELDS = ('sum_of_suspicion', 'heard_rumor', 'rumor_received', 'rumor_spread', 'cooldown')
+# the state a frame of the history of a run keeps one bit per person of
+FRAME_FIELDS = ('rumor_received', 'heard_rumor', 'rumor_spread')
+
+
+def neighbor_counts(padded, earlier_neighbor=ROW_MAJOR_EARLIER, out=None):
+    """
+    count for every interior cell how many of its neighbors are set, split by processing order
+    :param padded:  boolean array padded with a one cell wide empty border
+    :param earlier_neighbor:  for every offset, True/False if that neighbor is always/never processed earlier,
+                              or a boolean array of the interior shape
+    :param out:  optional (earlier, later, scratch) arrays to write into, scratch is a boolean array of the interior
+                 shape, so no memory is allocated
+    :return:  integer arrays (earlier, later) of counts in the padded shape (the border is always zero)
+    """
+    rows, cols = padded.shape[-2] - 2, padded.shape[-1] - 2
+    if out is None:
+        out = (np.zeros(padded.shape, dtype=np.int8), np.zeros(padded.shape, dtype=np.int8),
+               np.empty(padded[..., 1:-1, 1:-1].shape, dtype=bool))
+    earlier, later, scratch = out
+    earlier.fill(0)
+    later.fill(0)
+    inner_earlier = earlier[..., 1:-1, 1:-1]
+    inner_later = later[..., 1:-1, 1:-1]
+    for (di, dj), before in zip(MOORE_OFFSETS, earlier_neighbor):
+        shifted = padded[..., 1 + di:1 + di + rows, 1 + dj:1 + dj + cols]
+        if before is True:
+            inner_earlier += shifted
+        elif before is False:
+            inner_later += shifted
+        else:
+            np.logical_and(shifted, before, out=scratch)
+            inner_earlier += scratch
+            np.not_equal(shifted, scratch, out=scratch)
+            inner_later += scratch
+    return earlier, later
+
+
+def processing_order(n, rows, cols):
+    """
+    :param n:  size of grid
+    :param rows:  row of every person in the order Person.spread would be called in
+    :param cols:  column of every person in that order
+    :return:  (earlier_neighbor, rank), see neighbor_counts. rank is the processing rank of every padded cell,
+              None if the order is row-major
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    if np.all(np.diff(rows * n + cols) > 0):
+        return ROW_MAJOR_EARLIER, None
+    rank = np.full((n + 2, n + 2), -1, dtype=np.int64)
+    rank[rows + 1, cols + 1] = np.arange(len(rows))
+    inner = rank[1:-1, 1:-1]
+    return tuple(rank[1 + di:1 + di + n, 1 + dj:1 + dj + n] < inner for di, dj in MOORE_OFFSETS), rank
+
+
+def grid_starters(grid):
+    """
+    :param grid:  Grid object after create_rumor_spreader was called
+    :return:  padded (row, column) of every rumor starter of the grid
+    """
+    return [(int(grid.rows[k]) + 1, int(grid.cols[k]) + 1) for k in grid.starters]
+
+
+class VectorEngine:
+    """
+    engine that keeps the population as parallel typed arrays and advances a whole generation with array operations.
+    every array is padded with a one cell wide empty border so neighbors can be read without bounds checks.
+    the state that changes between generations is double buffered: a generation reads the current arrays, writes the
+    next one into the back buffer and the two are swapped, so stepping does not allocate any memory.
+    """
+
+    # leading dimensions of the state arrays in front of the grid, BatchEngine stacks replicates along one
+    batch_shape = ()
+    # the arrays a checkpoint keeps, the layout and the current generation
+    CHECKPOINT_FIELDS = ('occupied', 'suspicion', 'group') + STATE_FIELDS
+
+    def __init__(self, n, L, rng=None):
+        """
+        :param n:  size of grid
+        :param L:  number of generations a person waits before spreading the rumor again
+        :param rng:  numpy random generator used for the spread draws
+        """
+        self.n = n
+        self.L = L
+        self.rng = np.random.default_rng() if rng is None else rng
+        shape = self.batch_shape + (n + 2, n + 2)
+        self.occupied = np.zeros(shape, dtype=bool)
+        self.suspicion = np.zeros(shape, dtype=np.float64)
+        self.sum_of_suspicion = np.zeros(shape, dtype=np.float64)
+        self.heard_rumor = np.zeros(shape, dtype=bool)
+        self.rumor_received = np.zeros(shape, dtype=bool)
+        self.rumor_spread = np.zeros(shape, dtype=bool)
+        self.cooldown = np.zeros(shape, dtype=np.int32)
+        # suspicion group 1 - 4 of every person, 0 for an empty cell
+        self.group = np.zeros(shape, dtype=np.int8)
+        # running counters, updated by every step from the cells that changed
+        self.received = 0
+        self.spreaders = 0
+        self.hearing = 0
+        self.group_received = np.zeros(self.batch_shape + (5,), dtype=np.int64)
+        # back buffer for the next generation and scratch arrays for the intermediate results of a step
+        self.back = {name: np.zeros_like(getattr(self, name)) for name in STATE_FIELDS}
+        self.scratch = {
+            'draw': np.empty(shape, dtype=np.float64),
+            'ready': np.empty(shape, dtype=bool),
+            'waiting': np.empty(shape, dtype=bool),
+            'reset': np.empty(shape, dtype=bool),
+            'spreaders': np.empty(shape, dtype=bool),
+            'earlier': np.empty(shape, dtype=np.int8),
+            'later': np.empty(shape, dtype=np.int8),
+            'total': np.empty(shape, dtype=np.int8),
+            'count': np.empty(shape, dtype=np.int8),
+            'newly_received': np.empty(shape, dtype=bool),
+            'inner': np.empty(self.batch_shape + (n, n), dtype=bool),
+        }
+        self.starters = []
+        self.earlier_neighbor = ROW_MAJOR_EARLIER
+        # processing rank of every cell, None while the processing order is row-major
+        self.rank = None
+        self.generation = 0
+
+    @classmethod
+    def from_grid(cls, grid, L, rng=None):
+        """
+        build the engine state from a grid of person objects
+        :param grid:  Grid object after create_rumor_spreader was called
+        :param L:  L parameter of the run
+        :param rng:  numpy random generator used for the spread draws
+        """
+        engine = cls.from_records(PersonRecords.from_grid(grid), L, rng)
+        engine.starters = grid_starters(grid)
+        engine.generation = grid.generation
+        return engine
+
+    @classmethod
+    def from_records(cls, people, L, rng=None):
+        """
+        build the engine state from person records, the records are in processing order
+        :param people:  PersonRecords of the population
+        :param L:  L parameter of the run
+        :param rng:  numpy random generator used for the spread draws
+        """
+        engine = cls(people.n, L, rng)
+        engine.load_records(people)
+        engine.set_processing_order(people.records['i'], people.records['j'])
+        engine.count_state()
+        return engine
+
+    def load_records(self, people, index=()):
+        """
+        copy person records into the state arrays
+        :param people:  PersonRecords of the population
+        :param index:  leading index of the grid to copy into, the replicate of a BatchEngine
+        """
+        records = people.records
+        cells = index + (records['i'] + 1, records['j'] + 1)
+        self.occupied[cells] = True
+        for name in ('suspicion', 'sum_of_suspicion', 'heard_rumor', 'rumor_received', 'rumor_spread'):
+            getattr(self, name)[cells] = records[name]
+        self.cooldown[cells] = records['generation']
+        self.group[cells] = 4 - np.rint(3 * records['suspicion'])
+
+    def set_processing_order(self, rows, cols):
+        """
+        record the order Person.spread would be called in, if it is not row-major (like the spiral grid of part 2)
+        :param rows:  row of every person in processing order
+        :param cols:  column of every person in processing order
+        """
+        self.earlier_neighbor, self.rank = processing_order(self.n, rows, cols)
+
+    def count_state(self):
+        """
+        recount the running counters from the state arrays
+        """
+        self.received = int(np.count_nonzero(self.rumor_received))
+        self.spreaders = int(np.count_nonzero(self.rumor_spread))
+        self.hearing = int(np.count_nonzero(self.heard_rumor))
+        self.group_received = np.bincount(self.group[self.rumor_received], minlength=5).astype(np.int64)
+
+    def population(self):
+        return int(np.count_nonzero(self.occupied))
+
+    def generators(self):
+        """
+        :return:  the random generators of the engine, a checkpoint keeps their state
+        """
+        return [self.rng]
+
+    def state_frame(self, replicate=None):
+        """
+        :param replicate:  replicate of a BatchEngine to take the frame of
+        :return:  boolean array (fields, n, n) of the FRAME_FIELDS of every cell
+        """
+        arrays = [getattr(self, name) for name in FRAME_FIELDS]
+        if replicate is not None:
+            arrays = [array[replicate] for array in arrays]
+        return np.stack([array[1:-1, 1:-1] for array in arrays])
+
+    def received_count(self):
+        return self.received
+
+    def spreader_count(self):
+        return self.spreaders
+
+    def group_received_count(self, group):
+        """
+        :param group:  suspicion group 1 - 4
+        :return:  number of people in the group who received the rumor
+        """
+        return int(self.group_received[group])
+
+    def spread_rumor(self):
+        """
+        let the rumor starters spread the rumor to their neighbors, one after the other and in place,
+        the same way Grid.spread_rumor does
+        """
+        for cell in self.starters:
+            self.start_spread(cell, self.rng)
+        self.count_state()
+
+    def start_spread(self, cell, rng):
+        """
+        let one rumor starter spread the rumor to their neighbors, in place
+        :param cell:  padded index of the starter
+        :param rng:  numpy random generator to draw from
+        """
+        if not self.heard_rumor[cell] or self.cooldown[cell] != 0 or self.rumor_spread[cell]:
+            return
+        if rng.random() < self.sum_of_suspicion[cell]:
+            i, j = cell[-2:]
+            block = cell[:-2] + (slice(i - 1, i + 2), slice(j - 1, j + 2))
+            hit = self.occupied[block].copy()
+            hit[1, 1] = False
+            self.rumor_received[block] |= hit
+            self.heard_rumor[block] |= hit
+            self.sum_of_suspicion[block] = np.where(
+                hit, np.minimum(self.sum_of_suspicion[block] + self.suspicion[block], 1),
+                self.sum_of_suspicion[block])
+            self.rumor_spread[cell] = True
+            self.cooldown[cell] += self.L
+        self.heard_rumor[cell] = False
+        self.sum_of_suspicion[cell] = 0
+
+    def is_quiescent(self):
+        """
+        :return:  True if nobody heard the rumor and nobody is spreading it, then no later generation changes anything
+                  but clearing the spreading marks. a person still counting down L generations is frozen until they
+                  hear the rumor again, so their cooldown does not matter.
+        """
+        return self.hearing == 0 and self.spreaders == 0
+
+    def fast_forward(self, generation):
+        """
+        jump from a quiescent state straight to a later generation
+        :param generation:  the generation to jump to
+        """
+        self.rumor_spread.fill(False)
+        self.generation = generation
+        self.count_state()
+
+    def draw(self, out):
+        """
+        draw the uniform numbers every person compares their sum of suspicion to
+        :param out:  array to write the numbers into
+        """
+        self.rng.random(out=out)
+
+    def count_step(self, spreaders, newly_received):
+        """
+        update the running counters after a step, before the buffers are swapped
+        :param spreaders:  the people who spread the rumor in the step
+        :param newly_received:  the people who received the rumor for the first time in the step
+        """
+        # only the people who received the rumor for the first time change the counters
+        newly = self.group[newly_received]
+        if len(newly):
+            self.received += len(newly)
+            self.group_received += np.bincount(newly, minlength=5)
+        self.spreaders = int(np.count_nonzero(spreaders))
+        self.hearing = int(np.count_nonzero(self.back['heard_rumor']))
+
+    def swap_buffers(self):
+        """
+        make the back buffer the current generation and reuse the old current arrays as the next back buffer
+        """
+        for name in STATE_FIELDS:
+            front = getattr(self, name)
+            setattr(self, name, self.back[name])
+            self.back[name] = front
+
+    def step(self):
+        """
+        advance the whole grid by one generation, following the transitions of Person.spread
+        """
+        heard = self.heard_rumor
+        cooldown = self.cooldown
+        scratch = self.scratch
+        back = self.back
+        # people who heard the rumor last generation and are or are not waiting for L generations to pass
+        ready = np.logical_and(heard, np.equal(cooldown, 0, out=scratch['ready']), out=scratch['ready'])
+        waiting = np.not_equal(heard, ready, out=scratch['waiting'])
+        self.draw(scratch['draw'])
+        spreaders = np.less(scratch['draw'], self.sum_of_suspicion, out=scratch['spreaders'])
+        spreaders &= ready
+        np.greater(spreaders, self.rumor_spread, out=spreaders)
+
+        earlier, later = neighbor_counts(spreaders, self.earlier_neighbor,
+                                         out=(scratch['earlier'], scratch['later'], scratch['inner']))
+        earlier *= self.occupied
+        later *= self.occupied
+        total = np.add(earlier, later, out=scratch['total'])
+        count = scratch['count']
+
+        # a person who is ready resets their own state after earlier neighbors already told them again, so only later
+        # neighbors make them hear it. a waiting person keeps hearing it while counting down their L generations.
+        # either way only later neighbors count towards a sum of suspicion that was reset
+        reset = np.logical_and(waiting, np.equal(cooldown, 1, out=scratch['reset']), out=scratch['reset'])
+        reset |= ready
+        np.copyto(count, total)
+        np.copyto(count, later, where=reset)
+        np.multiply(count, self.suspicion, out=back['sum_of_suspicion'])
+        np.logical_not(reset, out=reset)
+        np.add(back['sum_of_suspicion'], self.sum_of_suspicion, out=back['sum_of_suspicion'], where=reset)
+        np.minimum(back['sum_of_suspicion'], 1, out=back['sum_of_suspicion'])
+
+        np.copyto(count, total)
+        np.copyto(count, later, where=heard)
+        np.greater(count, 0, out=back['heard_rumor'])
+        back['heard_rumor'] |= waiting
+        np.greater(total, 0, out=back['rumor_received'])
+        newly_received = np.greater(back['rumor_received'], self.rumor_received, out=scratch['newly_received'])
+        back['rumor_received'] |= self.rumor_received
+        np.multiply(spreaders, self.L, out=back['cooldown'])
+        back['cooldown'] += cooldown
+        back['cooldown'] -= waiting
+        np.copyto(back['rumor_spread'], spreaders)
+
+        self.count_step(spreaders, newly_received)
+        self.swap_buffers()
+        self.generation += 1
+
+
+class FrontierEngine(VectorEngine):
+    """
+    engine that only evaluates the people on the rumor front instead of the whole grid.
+    only a person who heard the rumor or is marked as spreading it changes state in a generation (apart from the
+    people they tell), a person counting down L generations without hearing the rumor is frozen until they hear it
+    again. so the engine keeps the flat indices of those people and the cost of a generation is proportional to
+    the size of the front, not the area of the grid.
+    """
+
+    def __init__(self, n, L, rng=None):
+        """
+        :param n:  size of grid
+        :param L:  number of generations a person waits before spreading the rumor again
+        :param rng:  numpy random generator used for the spread draws
+        """
+        super().__init__(n, L, rng)
+        width = n + 2
+        self.flat_offsets = np.array([di * width + dj for di, dj in MOORE_OFFSETS], dtype=np.int64)
+        # sorted flat indices of the people who heard the rumor or are spreading it
+        self.active = np.empty(0, dtype=np.int64)
+
+    def count_state(self):
+        """
+        recount the running counters and the front from the state arrays
+        """
+        super().count_state()
+        self.active = np.flatnonzero(self.heard_rumor | self.rumor_spread)
+
+    def spread_earlier(self, spreaders, targets):
+        """
+        :param spreaders:  flat index of the spreader of every (spreader, target) pair, shape (k, 1)
+        :param targets:  flat index of the target of every pair, shape (k, 8)
+        :return:  whether Person.spread is called on the spreader before the target
+        """
+        if self.rank is None:
+            return np.broadcast_to(self.flat_offsets > 0, targets.shape)
+        rank = self.rank.ravel()
+        return rank[spreaders] < rank[targets]
+
+    def step(self):
+        """
+        advance the rumor front by one generation, following the transitions of Person.spread
+        """
+        heard = self.heard_rumor.ravel()
+        cooldown = self.cooldown.ravel()
+        rumor_spread = self.rumor_spread.ravel()
+        sum_of_suspicion = self.sum_of_suspicion.ravel()
+        active = self.active
+
+        old_heard = heard[active]
+        old_cooldown = cooldown[active]
+        old_sum = sum_of_suspicion[active]
+        ready = old_heard & (old_cooldown == 0)
+        waiting = old_heard & (old_cooldown != 0)
+        spreading = ready & ~rumor_spread[active] & (self.rng.random(len(active)) < old_sum)
+        spreaders = active[spreading]
+
+        # every neighbor of a spreader who lives in the grid is told
+        targets = spreaders[:, None] + self.flat_offsets
+        earlier = self.spread_earlier(spreaders[:, None], targets)
+        lives = self.occupied.ravel()[targets]
+        targets = targets[lives]
+        earlier = earlier[lives]
+        # state of the targets before this generation decides which of the times they are told count
+        target_heard = heard[targets]
+        target_reset = target_heard & (cooldown[targets] <= 1)
+
+        # the people on the front update their own state (the same as VectorEngine.step)
+        reset = ready | (waiting & (old_cooldown == 1))
+        sum_of_suspicion[active] = np.where(reset, 0, old_sum)
+        heard[active] = waiting
+        cooldown[active] = old_cooldown + self.L * spreading - waiting
+        rumor_spread[active] = spreading
+
+        told, index = np.unique(targets, return_inverse=True)
+        heard_count = np.bincount(index, weights=~(target_heard & earlier), minlength=len(told))
+        belief_count = np.bincount(index, weights=~(target_reset & earlier), minlength=len(told))
+        sum_of_suspicion[told] = np.minimum(sum_of_suspicion[told] + belief_count * self.suspicion.ravel()[told], 1)
+        heard[told] |= heard_count > 0
+
+        rumor_received = self.rumor_received.ravel()
+        newly = told[~rumor_received[told]]
+        rumor_received[newly] = True
+        if len(newly):
+            self.received += len(newly)
+            self.group_received += np.bincount(self.group.ravel()[newly], minlength=5)
+        self.spreaders = len(spreaders)
+
+        self.active = np.union1d(active[waiting | spreading], told[heard[told]])
+        self.hearing = int(np.count_nonzero(heard[self.active]))
+        self.generation += 1
+
+
+class BatchEngine(VectorEngine):
+    """
+    engine that stacks replicates of the same configuration into (replicates, n + 2, n + 2) arrays and advances all of
+    them with the array operations of one VectorEngine step. every replicate has its own layout and draws from its own
+    random generator in the same order a VectorEngine would, so replicate r is the same run as a VectorEngine built
+    from the same grid and generator. the counters hold one value per replicate.
+    """
+
+    def __init__(self, n, L, rngs):
+        """
+        :param n:  size of grid
+        :param L:  number of generations a person waits before spreading the rumor again
+        :param rngs:  numpy random generator of every replicate
+        """
+        self.rngs = list(rngs)
+        self.batch_shape = (len(self.rngs),)
+        super().__init__(n, L, self.rngs[0])
+
+    @classmethod
+    def from_grids(cls, grids, L, rngs):
+        """
+        build the engine state from grids of person objects of the same size
+        :param grids:  Grid object of every replicate, after create_rumor_spreader was called
+        :param L:  L parameter of the run
+        :param rngs:  numpy random generator of every replicate, used for the spread draws
+        """
+        engine = cls(grids[0].n, L, rngs)
+        orders = []
+        for replicate, grid in enumerate(grids):
+            people = PersonRecords.from_grid(grid)
+            engine.load_records(people, (replicate,))
+            orders.append(processing_order(engine.n, people.records['i'], people.records['j'])[0])
+            engine.starters += [(replicate, i, j) for i, j in grid_starters(grid)]
+        if any(order is not ROW_MAJOR_EARLIER for order in orders):
+            shape = (engine.n, engine.n)
+            engine.earlier_neighbor = tuple(np.stack([np.broadcast_to(order[k], shape) for order in orders])
+                                            for k in range(len(MOORE_OFFSETS)))
+        engine.generation = grids[0].generation
+        engine.count_state()
+        return engine
+
+    def keep(self, replicates):
+        """
+        drop every replicate but the given ones, so replicates that finished stop costing a share of every step
+        :param replicates:  indices of the replicates to keep, in their new order
+        """
+        replicates = np.asarray(replicates, dtype=np.int64)
+        for name in ('occupied', 'suspicion', 'group') + STATE_FIELDS:
+            setattr(self, name, getattr(self, name)[replicates])
+            if name in self.back:
+                self.back[name] = self.back[name][replicates]
+        self.scratch = {name: array[replicates] for name, array in self.scratch.items()}
+        if self.earlier_neighbor is not ROW_MAJOR_EARLIER:
+            self.earlier_neighbor = tuple(before[replicates] for before in self.earlier_neighbor)
+        self.rngs = [self.rngs[replicate] for replicate in replicates]
+        self.batch_shape = (len(self.rngs),)
+        self.received = self.received[replicates]
+        self.spreaders = self.spreaders[replicates]
+        self.hearing = self.hearing[replicates]
+        self.group_received = self.group_received[replicates]
+
+    def count_state(self):
+        """
+        recount the running counters of every replicate from the state arrays
+        """
+        self.received = np.count_nonzero(self.rumor_received, axis=(1, 2))
+        self.spreaders = np.count_nonzero(self.rumor_spread, axis=(1, 2))
+        self.hearing = np.count_nonzero(self.heard_rumor, axis=(1, 2))
+        self.group_received = self.count_groups(self.rumor_received)
+
+    def count_groups(self, cells):
+        """
+        :param cells:  boolean array of the state shape
+        :return:  (replicates, 5) number of the set cells of every replicate in every suspicion group
+        """
+        replicate = np.nonzero(cells)[0]
+        counts = np.bincount(replicate * 5 + self.group[cells], minlength=5 * len(self.rngs))
+        return counts.reshape(len(self.rngs), 5).astype(np.int64)
+
+    def population(self):
+        return np.count_nonzero(self.occupied, axis=(1, 2))
+
+    def generators(self):
+        return self.rngs
+
+    def group_received_count(self, group):
+        """
+        :param group:  suspicion group 1 - 4
+        :return:  number of people in the group who received the rumor, for every replicate
+        """
+        return self.group_received[:, group]
+
+    def quiescent(self):
+        """
+        :return:  for every replicate, True if nobody heard the rumor and nobody is spreading it
+        """
+        return (self.hearing == 0) & (self.spreaders == 0)
+
+    def is_quiescent(self):
+        return bool(np.all(self.quiescent()))
+
+    def spread_rumor(self):
+        """
+        let the rumor starters of every replicate spread the rumor, drawing from the generator of their replicate
+        """
+        for cell in self.starters:
+            self.start_spread(cell, self.rngs[cell[0]])
+        self.count_state()
+
+    def draw(self, out):
+        for rng, replicate in zip(self.rngs, out):
+            rng.random(out=replicate)
+
+    def count_step(self, spreaders, newly_received):
+        self.received = self.received + np.count_nonzero(newly_received, axis=(1, 2))
+        self.group_received += self.count_groups(newly_received)
+        self.spreaders = np.count_nonzero(spreaders, axis=(1, 2))
+        self.hearing = np.count_nonzero(self.back['heard_rumor'], axis=(1, 2))
+
+
+class CompiledEngine(VectorEngine):
+    """
+    engine that runs the branchy transition of Person.spread cell by cell in a loop compiled with numba, over flat
+    views of the VectorEngine arrays. it draws the same numbers as VectorEngine, so both give the same runs.
+    without numba installed it steps with the array operations of VectorEngine.
+    """
+
+    def __init__(self, n, L, rng=None):
+        """
+        :param n:  size of grid
+        :param L:  number of generations a person waits before spreading the rumor again
+        :param rng:  numpy random generator used for the spread draws
+        """
+        super().__init__(n, L, rng)
+        width = n + 2
+        self.flat_offsets = np.array([di * width + dj for di, dj in MOORE_OFFSETS], dtype=np.int64)
+        # flat index of every person in processing order
+        self.order = np.empty(0, dtype=np.int64)
+
+    def set_processing_order(self, rows, cols):
+        super().set_processing_order(rows, cols)
+        self.order = (np.asarray(rows, dtype=np.int64) + 1) * (self.n + 2) + np.asarray(cols, dtype=np.int64) + 1
+
+    def step(self):
+        """
+        advance the whole grid by one generation, following the transitions of Person.spread
+        """
+        kernel = compiled_kernel()
+        if kernel is None:
+            return super().step()
+        self.draw(self.scratch['draw'])
+        front = tuple(getattr(self, name).ravel() for name in STATE_FIELDS)
+        back = tuple(self.back[name].ravel() for name in STATE_FIELDS)
+        received, self.spreaders, self.hearing = kernel(
+            self.order, self.flat_offsets, self.occupied.ravel(), self.suspicion.ravel(), self.group.ravel(),
+            self.scratch['draw'].ravel(), self.L, front, back, self.group_received)
+        self.received += received
+        self.swap_buffers()
+        self.generation += 1
+
+
+class GraphEngine:
+    """
+    engine for any neighborhood, given as a CSR adjacency list: person k tells the people
+    indices[indptr[k]:indptr[k + 1]], and Person.spread is called on the people in the order of their index.
+    the state is one flat array per field with an entry per person. the people told in a generation are counted with
+    bincount over the edges of the spreaders, a sparse matrix-vector product with the adjacency matrix, so a
+    generation costs the number of people plus the number of edges of the spreaders.
+    """
+
+    # the arrays a checkpoint keeps, the adjacency list is not copied
+    CHECKPOINT_FIELDS = ('suspicion', 'group') + STATE_FIELDS
+
+    def __init__(self, indptr, indices, suspicion, L, rng=None):
+        """
+        :param indptr:  the people person k tells are indices[indptr[k]:indptr[k + 1]]
+        :param indices:  index of the person told over every edge
+        :param suspicion:  suspicion level of every person
+        :param L:  number of generations a person waits before spreading the rumor again
+        :param rng:  numpy random generator used for the spread draws
+        """
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.L = L
+        self.rng = np.random.default_rng() if rng is None else rng
+        count = len(self.indptr) - 1
+        self.suspicion = np.asarray(suspicion, dtype=np.float64)
+        self.group = (4 - np.rint(3 * self.suspicion)).astype(np.int8)
+        self.sum_of_suspicion = np.zeros(count, dtype=np.float64)
+        self.heard_rumor = np.zeros(count, dtype=bool)
+        self.rumor_received = np.zeros(count, dtype=bool)
+        self.rumor_spread = np.zeros(count, dtype=bool)
+        self.cooldown = np.zeros(count, dtype=np.int32)
+        self.starters = []
+        # running counters, updated by every step from the people who changed
+        self.received = 0
+        self.spreaders = 0
+        self.hearing = 0
+        self.group_received = np.zeros(5, dtype=np.int64)
+        self.generation = 0
+
+    @classmethod
+    def from_grid(cls, grid, L, rng=None, topology="moore"):
+        """
+        build the engine state from a grid, with the neighbors of the given topology
+        :param grid:  Grid object after create_rumor_spreader was called
+        :param L:  L parameter of the run
+        :param rng:  numpy random generator used for the spread draws
+        :param topology:  neighborhood of a cell, see layouts.TOPOLOGIES
+        """
+        people = PersonRecords.from_grid(grid)
+        indptr, indices = grid.neighbor_graph(topology)
+        engine = cls(indptr, indices, people.records['suspicion'], L, rng)
+        for name in ('sum_of_suspicion', 'heard_rumor', 'rumor_received', 'rumor_spread'):
+            getattr(engine, name)[:] = people.records[name]
+        engine.cooldown[:] = people.records['generation']
+        engine.starters = list(grid.starters)
+        engine.generation = grid.generation
+        engine.count_state()
+        return engine
+
+    @classmethod
+    def from_graph(cls, indptr, indices, groups, starters, L, rng=None):
+        """
+        build the engine state of a graph that is not a grid, like a loaded social graph
+        :param indptr:  the people person k tells are indices[indptr[k]:indptr[k + 1]]
+        :param indices:  index of the person told over every edge
+        :param groups:  suspicion group 1 - 4 of every person
+        :param starters:  index of the rumor starters
+        :param L:  L parameter of the run
+        :param rng:  numpy random generator used for the spread draws
+        """
+        # suspicion levels 1, 2/3, 1/3 and 0 of the groups 1 - 4
+        engine = cls(indptr, indices, (4 - np.asarray(groups)) / 3, L, rng)
+        engine.starters = list(starters)
+        for name in ('heard_rumor', 'rumor_received'):
+            getattr(engine, name)[engine.starters] = True
+        engine.sum_of_suspicion[engine.starters] = 1
+        engine.count_state()
+        return engine
+
+    def count_state(self):
+        """
+        recount the running counters from the state arrays
+        """
+        self.received = int(np.count_nonzero(self.rumor_received))
+        self.spreaders = int(np.count_nonzero(self.rumor_spread))
+        self.hearing = int(np.count_nonzero(self.heard_rumor))
+        self.group_received = np.bincount(self.group[self.rumor_received], minlength=5).astype(np.int64)
+
+    def population(self):
+        return len(self.suspicion)
+
+    def generators(self):
+        """
+        :return:  the random generators of the engine, a checkpoint keeps their state
+        """
+        return [self.rng]
+
+    def state_frame(self, replicate=None):
+        """
+        :return:  boolean array (fields, people) of the FRAME_FIELDS of every person
+        """
+        return np.stack([getattr(self, name) for name in FRAME_FIELDS])
+
+    def received_count(self):
+        return self.received
+
+    def spreader_count(self):
+        return self.spreaders
+
+    def group_received_count(self, group):
+        """
+        :param group:  suspicion group 1 - 4
+        :return:  number of people in the group who received the rumor
+        """
+        return int(self.group_received[group])
+
+    def edges_of(self, sources):
+        """
+        :param sources:  index of the people who tell their neighbors
+        :return:  (source, target) index arrays of every edge going out of the sources
+        """
+        starts = self.indptr[sources]
+        counts = self.indptr[sources + 1] - starts
+        # index of every edge: the start of the row of its source plus its position in that row
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        edges = np.repeat(starts, counts) + np.arange(counts.sum()) - first
+        return np.repeat(sources, counts), self.indices[edges]
+
+    def spread_rumor(self):
+        """
+        let the rumor starters spread the rumor to their neighbors, one after the other and in place,
+        the same way Grid.spread_rumor does
+        """
+        for starter in self.starters:
+            if not self.heard_rumor[starter] or self.cooldown[starter] != 0 or self.rumor_spread[starter]:
+                continue
+            if self.rng.random() < self.sum_of_suspicion[starter]:
+                targets = self.edges_of(np.array([starter]))[1]
+                self.rumor_received[targets] = True
+                self.heard_rumor[targets] = True
+                self.sum_of_suspicion[targets] = np.minimum(self.sum_of_suspicion[targets] + self.suspicion[targets], 1)
+                self.rumor_spread[starter] = True
+                self.cooldown[starter] += self.L
+            self.heard_rumor[starter] = False
+            self.sum_of_suspicion[starter] = 0
+        self.count_state()
+
+    def is_quiescent(self):
+        """
+        :return:  True if nobody heard the rumor and nobody is spreading it, see VectorEngine.is_quiescent
+        """
+        return self.hearing == 0 and self.spreaders == 0
+
+    def fast_forward(self, generation):
+        """
+        jump from a quiescent state straight to a later generation
+        :param generation:  the generation to jump to
+        """
+        self.rumor_spread.fill(False)
+        self.generation = generation
+        self.count_state()
+
+    def step(self):
+        """
+        advance every person by one generation, following the transitions of Person.spread (see VectorEngine.step)
+        """
+        heard = self.heard_rumor
+        cooldown = self.cooldown
+        count = len(heard)
+        ready = heard & (cooldown == 0)
+        waiting = heard & (cooldown != 0)
+        spreaders = ready & ~self.rumor_spread & (self.rng.random(count) < self.sum_of_suspicion)
+
+        # a source with a higher index than its target is processed later, so the target hears it after resetting
+        sources, targets = self.edges_of(np.flatnonzero(spreaders))
+        total = np.bincount(targets, minlength=count)
+        later = np.bincount(targets[sources > targets], minlength=count)
+
+        reset = ready | (waiting & (cooldown == 1))
+        belief_count = np.where(reset, later, total)
+        self.sum_of_suspicion = np.minimum(np.where(reset, 0, self.sum_of_suspicion) +
+                                           belief_count * self.suspicion, 1)
+        self.heard_rumor = waiting | (np.where(heard, later, total) > 0)
+        newly_received = (total > 0) & ~self.rumor_received
+        self.rumor_received |= newly_received
+        self.cooldown = (cooldown + self.L * spreaders - waiting).astype(np.int32)
+        self.rumor_spread = spreaders
+
+        newly = self.group[newly_received]
+        if len(newly):
+            self.received += len(newly)
+            self.group_received += np.bincount(newly, minlength=5)
+        self.spreaders = int(np.count_nonzero(spreaders))
+        self.hearing = int(np.count_nonzero(self.heard_rumor))
+        self.generation += 1
+
+
+# the engines a research run can choose from, besides stepping the Person objects
+ENGINES = {'vector': VectorEngine, 'frontier': FrontierEngine, 'compiled': CompiledEngine, 'graph': GraphEngine}
@@ -0,0 +1,160 @@
+import tkinter as tk
+from tkinter import ttk as ttk
+from tkinter import Canvas
+from rendering import CANVAS_LIMIT, CanvasRenderer, ImageRenderer, StatBox
+from simulation import Simulation
+from worker import SimulationWorker
+
+
+class Game(tk.Tk):
+    """
+    The main application window.
+    """
+
+    # layout of the simulation, see Simulation
+    layout = "random"
+    # seconds the first generation is shown for before the rumor is spread
+    start_delay = 5
+
+    def __init__(self, params, width_and_height=750, renderer=None, fps=30, stats_interval=0.25):
+        """
+        :param params:  list of parameters
+        :param width_and_height:  width and height of the application window
+        :param renderer:  "canvas" to draw a rectangle per person, "image" to draw the grid as one image. by default
+                          grids larger than CANVAS_LIMIT are drawn as an image
+        :param fps:  number of frames the window shows per second at most, the generations the simulation runs
+                     between two frames are not drawn
+        :param stats_interval:  seconds between two updates of the stat box
+        """
+
+        super().__init__()
+        self.title("I Heard a Rumor")
+
+        # Prevent the application window from being resized.
+        self.resizable(False, False)
+
+        # Set the height and width of the application.
+        self.width_and_height = width_and_height
+        self.resolution = params[0]
+        self.size_factor = self.width_and_height / self.resolution
+
+        # Set up the size of the canvas.
+        self.geometry(str(self.width_and_height) + "x" + str(800))
+
+        # create frame
+        self.info_frame = tk.Frame(self)
+        self.info_frame.pack()
+        self.right_frame = tk.Frame(self.info_frame)
+        self.left_frame = tk.Frame(self.info_frame)
+        self.right_frame.grid(row=0, column=1)
+        self.left_frame.grid(row=0, column=0)
+        self.canvas_frame = tk.Frame(self)
+        self.canvas_frame.pack()
+
+        # create skip to end button
+        self.next_skip_end = ttk.Button(self.left_frame, text="Skip to End", command=self.skip_to_end)
+        self.next_skip_end.grid(row=1, column=0)
+        # create quit button
+        self.quit_button = ttk.Button(self.left_frame, text="Quit", command=self.destroy)
+        self.quit_button.grid(row=2, column=0)
+        # progress of a skip to the end, shown under the buttons while the simulation runs to the end
+        self.progress = ttk.Progressbar(self.left_frame, length=100)
+
+        # create stat box
+        self.stat_box = tk.Text(self.right_frame, height=8, width=60)
+        self.stat_box.pack()
+        # only the lines that changed are rewritten, at most once every stats_interval seconds
+        self.stat_lines = StatBox(self.stat_box, stats_interval)
+
+        # Create the canvas widget and add it to the Tkinter application window.
+        self.canvas = Canvas(self.canvas_frame, width=self.width_and_height, height=self.width_and_height, bg='white')
+        self.canvas.pack()
+
+        # create the simulation, the board is drawn from its grid
+        self.simulation = Simulation(params, engine="compiled", stop_early=False, fast_forward=True,
+                                     layout=self.layout)
+        self.grid = self.simulation.grid
+        self.milestones = self.simulation.milestones
+        self.L_params = self.simulation.L_params
+        # set generation limit
+        self.generation_limit = self.simulation.generation_limit
+        # the squares of the people are created once and only redrawn when they change, a large grid is painted
+        # into one image instead
+        if renderer is None:
+            renderer = "canvas" if self.resolution <= CANVAS_LIMIT else "image"
+        if renderer == "canvas":
+            self.renderer = CanvasRenderer(self.canvas, self.resolution, self.size_factor)
+        else:
+            self.renderer = ImageRenderer(self.canvas, self.resolution, self.width_and_height)
+        # the simulation runs in a worker thread, the window shows the newest of its frames fps times a second
+        self.fps = fps
+        self.worker = SimulationWorker(self.simulation, start_delay=self.start_delay)
+        self.worker.start()
+        self.after_id = self.after(0, self.show_frames)
+
+    def generate_board(self, frame):
+        """
+        Draw the people who changed since the last frame.
+        :param frame:  frame of the worker to draw
+        """
+        self.renderer.draw(frame['visual'])
+        self.update_stat_box(frame)
+
+    def show_frames(self):
+        """
+        draw the newest frame of the worker, the frames before it are dropped, and check again in 1 / fps seconds
+        """
+        if self.worker.skipping.is_set() and self.worker.is_alive():
+            # nothing is drawn while skipping, the last generation is drawn once the worker reached it
+            self.progress['value'] = self.worker.generation
+        else:
+            frame = self.worker.latest()
+            if frame is not None:
+                self.generate_board(frame)
+                self.progress.grid_remove()
+        if self.worker.is_alive() or not self.worker.frames.empty():
+            self.stat_lines.flush()
+            self.after_id = self.after(int(1000 / self.fps), self.show_frames)
+        else:
+            # the stats of the last frame are shown even if the last update was too recent
+            self.stat_lines.flush(force=True)
+
+    def update_stat_box(self, frame):
+        """
+        update the stat box
+        :param frame:  frame of the worker to show the stats of
+        """
+        # add grid stats.csv to stat box
+        lines = [("population density: " + str(self.grid.p), ()),
+                 ("L param " + str(self.L_params), ()),
+                 # add "game stats.csv" to stat box in bold font underlined
+                 ("Game stats.csv:", 'underline'),
+                 # the generation and the percent of people who received the rumor, from the counters of the engine
+                 ("Generation: " + str(frame['generation']), ()),
+                 ("Percent of people who received the rumor: " + str(frame['percent received']) + "%", ())]
+
+        # add the generation the population reached each milestone of rumor received
+        for milestone, generation in frame['milestones']:
+            lines.append(("Generation " + str(milestone) + "% rumor received: " + str(generation), ()))
+        self.stat_lines.update(lines)
+
+    def skip_to_end(self):
+        """
+        skip to the end of the simulation, the worker stops making frames and runs the simulation without drawing it,
+        the window shows its progress and draws the last generation once
+        """
+        if not self.worker.is_alive():
+            # the simulation already reached its end and the last generation is drawn
+            return
+        self.next_skip_end.state(['disabled'])
+        self.progress.configure(maximum=self.generation_limit, value=self.grid.generation)
+        self.progress.grid(row=3, column=0)
+        self.worker.skip()
+
+    def destroy(self):
+        """
+        stop the worker and close the window
+        """
+        self.worker.stop()
+        self.after_cancel(self.after_id)
+        super().destroy()
@@ -1,57 +1,43 @@
-import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
-
-# sort stats.csv by 'L value' and ' P value' and 'S1 value' in file
-
-# read data from stats.csv
-df = pd.read_csv('stats.csv')
-
-# remove any row with p_value = 0.5
-df = df[df['P value'] != 0.5]
-# convert non-numeric columns to numeric types
-df['25 percentile'] = pd.to_numeric(df['25 percentile'], errors='coerce').fillna(0)
-df['50 percentile'] = pd.to_numeric(df['50 percentile'], errors='coerce').fillna(0)
-df['75 percentile'] = pd.to_numeric(df['75 percentile'], errors='coerce').fillna(0)
-df['final percentile'] = pd.to_numeric(df['final percentile'], errors='coerce').fillna(0)
-
-# group by 'L value' and ' P value' and 'S1 value' and calculate average of each group
-grouped = df.groupby(['L value', 'P value', 'S1 value']).mean()
-# remove from dataframe any group whos mean 25 percentile is more than 10% away from median 25 percentile
-grouped = grouped[abs(grouped['25 percentile'] - grouped['25 percentile'].median()) < grouped['25 percentile'].median() * 0.1]
-# remove from dataframe any group whos mean 50 percentile is more than 10% away from median 50 percentile
-grouped = grouped[abs(grouped['50 percentile'] - grouped['50 percentile'].median()) < grouped['50 percentile'].median() * 0.1]
-# remove from dataframe any group whos mean 75 percentile is more than 10% away from median 75 percentile
-grouped = grouped[abs(grouped['75 percentile'] - grouped['75 percentile'].median()) < grouped['75 percentile'].median() * 0.1]
-# display only first 5 rows
-print(grouped)
-# create new dataframe containing groups with L=0,1,3,5
-grouped = grouped.loc[[0, 1, 3, 5]]
+from aggregate import grouped_stats
+from results import load_results
+
+# read the runs of the results store short_run.py writes, a stats .csv file can be loaded the same way
+table = load_results('stats')
+
+# remove any run with p_value = 0.5
+keep = np.ma.getdata(table['P value']) != 0.5
+table = {name: column[keep] for name, column in table.items()}
+
+# group by 'L value' and 'P value' and 'S1 value' and calculate the mean, median and 95% confidence interval of
+# each group. a run that never reached a milestone is left out of its mean instead of counting as generation 0
+milestones = ['25 percentile', '50 percentile', '75 percentile']
+grouped = grouped_stats(table, ['L value', 'P value', 'S1 value'], milestones + ['final percentile'])
+# remove any group whos mean 25 percentile is more than 10% away from the median of the means, then do the same for
+# the 50 and 75 percentile with the median of the groups that are left
+keep = np.ones(len(grouped['runs']), dtype=bool)
+for milestone in milestones:
+    mean = grouped[milestone + ' mean']
+    median = np.nanmedian(mean[keep]) if keep.any() else np.nan
+    keep &= abs(mean - median) < median * 0.1
+# print the groups that are left
+for group in np.flatnonzero(keep):
+    print('L: ' + str(grouped['L value'][group]) + ' P: ' + str(grouped['P value'][group]) +
+          ' S1: ' + str(grouped['S1 value'][group]) + ' runs: ' + str(grouped['runs'][group]) + ' ' +
+          ' '.join(milestone + ': ' + str(round(grouped[milestone + ' mean'][group], 2)) + ' [' +
+                   str(round(grouped[milestone + ' low'][group], 2)) + ', ' +
+                   str(round(grouped[milestone + ' high'][group], 2)) + ']' for milestone in milestones))
+# keep the groups with L=0,1,3,5
+keep &= np.isin(grouped['L value'], [0, 1, 3, 5])
+# line style of every L: dashed for L=0, dotted for L=1, loose dotted for L=3 and solid for L=5
+linestyles = {0: '--', 1: ':', 3: '-.', 5: '-'}
 plt.figure(figsize=(20, 15))
-for index, row in grouped.iterrows():
-    if index[0] == 0:
-        # make linestyle dashed if L=0
-        linestyle = '--'
-    elif index[0] == 1:
-        # make linestyle dotted if L=1
-        linestyle = ':'
-    elif index[0] == 3:
-        # make linestyle loose dotted if L=3
-        linestyle = '-.'
-    else:
-        # make linestyle solid if L=5
-        linestyle = '-'
-
-# grouped = grouped.loc[[0, 5]]
-#
-# plt.figure(figsize=(20, 15))
-# for index, row in grouped.iterrows():
-#     if index[0] == 0:
-#         linestyle = '--'
-#     else:
-#         linestyle = '-'
-    plt.plot([25, 50, 75, row['final percentile']],
-             [row['25 percentile'], row['50 percentile'], row['75 percentile'], 100],
-             label='L: ' + str(index[0]) + ' P: ' + str(index[1]) + ' S1: ' + str(index[2]), linestyle=linestyle)
+for group in np.flatnonzero(keep):
+    L, P, S1 = grouped['L value'][group], grouped['P value'][group], grouped['S1 value'][group]
+    plt.plot([25, 50, 75, grouped['final percentile mean'][group]],
+             [grouped[milestone + ' mean'][group] for milestone in milestones] + [100],
+             label='L: ' + str(L) + ' P: ' + str(P) + ' S1: ' + str(S1), linestyle=linestyles[L])
 # set title and labels in big font
 plt.title('L 0,1,3,5 vs P vs S1, 10% from median', fontsize=20)
 plt.xlabel('percentile', fontsize=20)
@@ -0,0 +1,110 @@
+import zipfile
+
+import numpy as np
+
+# the aggregates recorded every generation and their types, group_received has a column for every group 1 - 4
+AGGREGATES = (('generation', np.int32), ('percent_received', np.float32), ('received', np.int64),
+              ('spreaders', np.int64), ('hearing', np.int64), ('group_received', np.int64))
+
+
+class HistoryRecorder:
+    """
+    records the aggregates of every generation of a run and, optionally, a frame of its state: one bit per person of
+    every field of engine.FRAME_FIELDS. the history is written to a compressed .npz file: frames are bit-packed and
+    appended to the file in chunks of generations while the run goes on, the aggregates are added when it is closed.
+    every frame of a chunk but the first is stored as the XOR with the frame before it, which is zero for everyone
+    whose state did not change, so the chunks compress well with the fastest compression level.
+    load it back with numpy.load(path) and unpack_frames.
+    """
+
+    def __init__(self, path, frames=False, chunk=64):
+        """
+        :param path:  .npz file to write the history to, it is overwritten
+        :param frames:  also record a frame of the state every generation
+        :param chunk:  number of frames to keep in memory before they are compressed and appended to the file
+        """
+        self.path = path
+        self.frames = frames
+        self.chunk = chunk
+        # one (generation, percent_received, received, spreaders, hearing, group 1 - 4 received) row per generation
+        self.rows = []
+        self.pending = []
+        self.chunks = 0
+        self.frame_shape = None
+        self.previous = None
+        self.archive = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1)
+
+    def record(self, generation, percent_received, received, spreaders, hearing, group_received, frame=None):
+        """
+        :param generation:  the generation
+        :param percent_received:  percent of people who received the rumor
+        :param received:  number of people who received the rumor
+        :param spreaders:  number of people spreading the rumor, -1 if not known
+        :param hearing:  number of people who heard the rumor, -1 if not known
+        :param group_received:  number of people who received the rumor in every group, by group 1 - 4
+        :param frame:  boolean array (fields, ...) of the state, recorded if the recorder keeps frames
+        """
+        self.rows.append((generation, percent_received, received, spreaders, hearing, *group_received))
+        if self.frames and frame is not None:
+            self.frame_shape = frame.shape
+            packed = np.packbits(frame)
+            self.pending.append(packed if self.previous is None else packed ^ self.previous)
+            self.previous = packed
+            if len(self.pending) >= self.chunk:
+                self.flush()
+
+    def record_engine(self, generation, percent_received, engine, replicate=None):
+        """
+        record a generation from the running counters of an array engine, which cost nothing to read
+        :param generation:  the generation
+        :param percent_received:  percent of people who received the rumor
+        :param engine:  array engine of the run
+        :param replicate:  replicate of a BatchEngine to record
+        """
+        received, spreaders, hearing, group_received = \
+            engine.received, engine.spreaders, engine.hearing, engine.group_received
+        if replicate is not None:
+            received, spreaders, hearing, group_received = \
+                received[replicate], spreaders[replicate], hearing[replicate], group_received[replicate]
+        frame = engine.state_frame(replicate) if self.frames else None
+        self.record(generation, percent_received, int(received), int(spreaders), int(hearing),
+                    group_received[1:].tolist(), frame)
+
+    def flush(self):
+        """
+        compress the pending frames and append them to the file as one chunk
+        """
+        if not self.pending:
+            return
+        self.write('frames_' + str(self.chunks).zfill(5), np.stack(self.pending))
+        self.chunks += 1
+        self.pending = []
+        self.previous = None
+
+    def write(self, name, array):
+        with self.archive.open(name + '.npy', 'w', force_zip64=True) as file:
+            np.lib.format.write_array(file, np.asarray(array))
+
+    def close(self):
+        """
+        write the pending frames and the aggregates and close the file
+        """
+        self.flush()
+        rows = np.array(self.rows, dtype=np.float64).reshape(-1, 9)
+        columns = (rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3], rows[:, 4], rows[:, 5:])
+        for (name, dtype), column in zip(AGGREGATES, columns):
+            self.write(name, column.astype(dtype))
+        if self.frame_shape is not None:
+            self.write('frame_shape', np.array(self.frame_shape, dtype=np.int64))
+        self.archive.close()
+
+
+def unpack_frames(history):
+    """
+    :param history:  history loaded with numpy.load
+    :return:  boolean array (generations, fields, ...) of every recorded frame
+    """
+    shape = tuple(history['frame_shape'])
+    names = sorted(name for name in history.files if name.startswith('frames_'))
+    packed = np.concatenate([np.bitwise_xor.accumulate(history[name]) for name in names])
+    return np.unpackbits(packed, axis=1, count=int(np.prod(shape))).astype(bool).reshape((len(packed),) + shape)
@@ -0,0 +1,82 @@
+import importlib.util
+
+# numba is optional, without it CompiledEngine steps with the array operations of VectorEngine. it is only imported by
+# compiled_kernel, so the runs that don't use the compiled engine don't pay for importing it
+HAVE_NUMBA = importlib.util.find_spec('numba') is not None
+# spread_generation compiled with numba, once compiled_kernel compiled it
+_compiled = None
+
+
+def spread_generation(order, offsets, occupied, suspicion, group, draw, L, front, back, group_received):
+    """
+    advance one generation by calling the transition of Person.spread on every person in processing order, exactly
+    like Simulation.generation does on the Person objects. all arrays are flat views of the padded engine arrays.
+    :param order:  flat index of every person in processing order
+    :param offsets:  flat offsets of the 8 neighbors
+    :param occupied:  True for the cells with a person
+    :param suspicion:  suspicion level of every person
+    :param group:  suspicion group of every person
+    :param draw:  uniform number of every cell the sum of suspicion is compared to
+    :param L:  number of generations a person waits before spreading the rumor again
+    :param front:  (sum_of_suspicion, heard_rumor, rumor_received, rumor_spread, cooldown) of this generation
+    :param back:  the same arrays, the next generation is written into them
+    :param group_received:  number of people who received the rumor in every group, updated in place
+    :return:  (newly received, spreaders, hearing) counts of the next generation
+    """
+    sum_front, heard_front, received_front, spread_front, cooldown_front = front
+    sum_back, heard_back, received_back, spread_back, cooldown_back = back
+    for cell in order:
+        sum_back[cell] = sum_front[cell]
+        heard_back[cell] = heard_front[cell]
+        received_back[cell] = received_front[cell]
+        spread_back[cell] = spread_front[cell]
+        cooldown_back[cell] = cooldown_front[cell]
+
+    received = 0
+    spreaders = 0
+    for cell in order:
+        if heard_front[cell] and cooldown_front[cell] == 0:
+            if not spread_front[cell]:
+                if draw[cell] < sum_front[cell]:
+                    for offset in offsets:
+                        neighbor = cell + offset
+                        if occupied[neighbor]:
+                            if not received_back[neighbor]:
+                                received_back[neighbor] = True
+                                group_received[group[neighbor]] += 1
+                                received += 1
+                            heard_back[neighbor] = True
+                            sum_back[neighbor] = min(sum_back[neighbor] + suspicion[neighbor], 1.0)
+                    spread_back[cell] = True
+                    cooldown_back[cell] += L
+                    spreaders += 1
+            else:
+                spread_back[cell] = False
+            heard_back[cell] = False
+            sum_back[cell] = 0.0
+        elif heard_front[cell]:
+            # a waiting person keeps hearing the rumor while counting down their L generations
+            cooldown_back[cell] -= 1
+            spread_back[cell] = False
+            if cooldown_back[cell] == 0:
+                sum_back[cell] = 0.0
+        else:
+            spread_back[cell] = False
+
+    hearing = 0
+    for cell in order:
+        if heard_back[cell]:
+            hearing += 1
+    return received, spreaders, hearing
+
+
+def compiled_kernel():
+    """
+    :return:  spread_generation compiled with numba, imported and compiled the first time it is called, None without
+              numba installed
+    """
+    global _compiled
+    if _compiled is None and HAVE_NUMBA:
+        from numba import njit
+        _compiled = njit(cache=True)(spread_generation)
+    return _compiled
@@ -0,0 +1,171 @@
+import os
+import shutil
+
+import numpy as np
+
+from engine import MOORE_OFFSETS
+
+# (row, column) offsets of the neighbors of a cell in every topology of the grid, a hex grid has different offsets
+# for the even and the odd rows and the torus wraps around the edges
+TOPOLOGIES = {
+    'moore': MOORE_OFFSETS,
+    'von_neumann': ((-1, 0), (0, -1), (0, 1), (1, 0)),
+    'torus': MOORE_OFFSETS,
+    'hex': (((-1, -1), (-1, 0)), ((-1, 0), (-1, 1)), ((0, -1), (0, -1)), ((0, 1), (0, 1)), ((1, -1), (1, 0)),
+            ((1, 0), (1, 1))),
+}
+# (row, column) step of every direction, in the order the spiral turns
+DIRECTIONS = {'right': (0, 1), 'down': (1, 0), 'left': (0, -1), 'up': (-1, 0)}
+
+
+def spiral_path(x, y, length, direction):
+    """
+    the cells the spiral of part 2 walks through: it goes length cells in the first direction, turns clockwise,
+    steps into the next direction and goes 2 cells less each time it turns. the cells alternate between an S4
+    person and an empty cell, starting with a person.
+    :param x:  row to start from
+    :param y:  column to start from
+    :param length:  length of the first side, the size of the grid
+    :param direction:  direction of the first side, "right", "down", "left" or "up"
+    :return:  (cells, 2) array of the (row, column) of every cell of the spiral, in walking order
+    """
+    turns = list(DIRECTIONS)
+    first = turns.index(direction)
+    sides = np.arange(length, 0, -2)
+    # every side after the first starts with the step that turned into it, so side k takes sides[k] steps in its
+    # direction, except the first which starts on the first cell
+    side_directions = (first + np.arange(len(sides))) % 4
+    steps = np.array([DIRECTIONS[turn] for turn in turns], dtype=np.int64)[np.repeat(side_directions, sides)[1:]]
+    return np.concatenate([[[x, y]], steps.reshape(-1, 2)]).cumsum(axis=0)[:sides.sum()]
+
+
+class Layout:
+    """
+    the people of a grid, without any rumor state: their cells and suspicion groups in processing order and the CSR
+    list of the neighbors who live in the grid. a layout only depends on its key, so it can be saved once and loaded
+    by every run with the same key.
+    """
+
+    # the arrays a layout is made of, every one is saved to its own .npy file
+    FIELDS = ('rows', 'cols', 'groups', 'indptr', 'indices')
+
+    def __init__(self, n, rows, cols, groups, indptr=None, indices=None):
+        """
+        :param n:  size of grid
+        :param rows:  row of every person, in processing order
+        :param cols:  column of every person, in processing order
+        :param groups:  suspicion group 1 - 4 of every person
+        :param indptr:  the neighbors of person k are indices[indptr[k]:indptr[k + 1]], computed if None
+        :param indices:  person index of every neighbor, in the order of MOORE_OFFSETS
+        """
+        self.n = n
+        self.rows = rows
+        self.cols = cols
+        self.groups = groups
+        if indptr is None:
+            indptr, indices = neighbor_lists(n, rows, cols)
+        self.indptr = indptr
+        self.indices = indices
+
+    def save(self, directory):
+        """
+        save the layout to a directory of .npy files, through a temporary directory so a run never loads a layout
+        that is still being written
+        """
+        temporary = directory + '.' + str(os.getpid()) + '.tmp'
+        os.makedirs(temporary, exist_ok=True)
+        for name in self.FIELDS:
+            np.save(os.path.join(temporary, name + '.npy'), getattr(self, name))
+        try:
+            os.rename(temporary, directory)
+        except OSError:
+            # another process saved the same layout first
+            shutil.rmtree(temporary, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory, n):
+        """
+        load a saved layout memory-mapped, so the processes that load it share its pages instead of copying them
+        """
+        arrays = {name: np.load(os.path.join(directory, name + '.npy'), mmap_mode='r') for name in cls.FIELDS}
+        return cls(n, **arrays)
+
+
+def neighbor_lists(n, rows, cols, topology="moore"):
+    """
+    :param n:  size of grid
+    :param rows:  row of every person
+    :param cols:  column of every person
+    :param topology:  neighborhood of a cell, one of TOPOLOGIES
+    :return:  (indptr, indices) CSR list of the person index of the neighbors of every person who live in the grid
+    """
+    offsets = TOPOLOGIES[topology]
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    # person index of every cell, padded with a border of empty cells so no bounds checks are needed
+    index = np.full((n + 2, n + 2), -1, dtype=np.int64)
+    index[rows + 1, cols + 1] = np.arange(len(rows))
+    odd = rows % 2 == 1
+    columns = []
+    for offset in offsets:
+        if topology == "hex":
+            # the odd rows of a hex grid are shifted half a cell to the right
+            (di, dj), (odd_di, odd_dj) = offset
+            di, dj = np.where(odd, odd_di, di), np.where(odd, odd_dj, dj)
+        else:
+            di, dj = offset
+        neighbor_rows, neighbor_cols = rows + di, cols + dj
+        if topology == "torus":
+            neighbor_rows, neighbor_cols = neighbor_rows % n, neighbor_cols % n
+        columns.append(index[neighbor_rows + 1, neighbor_cols + 1])
+    neighbors = np.stack(columns, axis=1)
+    lives = neighbors >= 0
+    indptr = np.concatenate([[0], np.cumsum(lives.sum(axis=1))])
+    return indptr, neighbors[lives]
+
+
+def load_graph(path, directed=False):
+    """
+    load a graph from an edge list file, with one "source target" pair of node ids per line
+    :param path:  edge list file, lines starting with # are skipped
+    :param directed:  only the source of an edge tells the target, by default both tell each other
+    :return:  (count, indptr, indices) number of nodes and the CSR list of the people every node tells, the nodes are
+              numbered in the order of their ids, which is the order they are processed in
+    """
+    edges = np.loadtxt(path, dtype=np.int64, comments='#', ndmin=2)[:, :2]
+    ids, edges = np.unique(edges, return_inverse=True)
+    edges = edges.reshape(-1, 2)
+    if not directed:
+        edges = np.concatenate([edges, edges[:, ::-1]])
+    # a person is only told once by the same neighbor and never tells themselves, sorting the edges by
+    # source * count + target also sorts them by source for the CSR list
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    keys = np.sort(edges[:, 0] * len(ids) + edges[:, 1])
+    keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])]
+    sources, targets = np.divmod(keys, len(ids))
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(sources, minlength=len(ids)))])
+    return len(ids), indptr, targets
+
+
+def layout_key(n, layout, p, s1, s2, s3, seed):
+    """
+    :return:  name of the layout of a run in the cache, the spiral does not depend on anything but n
+    """
+    if layout == "spiral":
+        return 'spiral_' + str(n)
+    return '_'.join(map(str, ('random', n, p, s1, s2, s3, seed)))
+
+
+def cached_layout(key, n, build, cache_dir):
+    """
+    :param key:  name of the layout in the cache
+    :param n:  size of grid
+    :param build:  function that builds the Layout when it is not in the cache yet
+    :param cache_dir:  directory of the cache
+    :return:  the Layout of the key, memory-mapped from the cache
+    """
+    directory = os.path.join(cache_dir, 'layout_' + key)
+    if not os.path.exists(directory):
+        os.makedirs(cache_dir, exist_ok=True)
+        build().save(directory)
+    return Layout.load(directory, n)
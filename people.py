@@ -0,0 +1,73 @@
+import numpy as np
+
+# one record per person, the same state a Person object holds
+PERSON_DTYPE = np.dtype([
+    ('i', np.int32),
+    ('j', np.int32),
+    ('suspicion', np.float64),
+    ('sum_of_suspicion', np.float64),
+    ('generation', np.int32),
+    ('rumor_spreader', np.bool_),
+    ('rumor_received', np.bool_),
+    ('heard_rumor', np.bool_),
+    ('rumor_spread', np.bool_),
+])
+
+
+class PersonRecords:
+    """
+    a population stored as one structured numpy array with a record per person, in processing order, the format the
+    array engines are built from.
+    """
+
+    def __init__(self, n, L, count):
+        """
+        :param n:  size of grid
+        :param L:  number of generations a person waits before spreading the rumor again, the same for everyone
+        :param count:  number of people
+        """
+        self.n = n
+        self.L = L
+        self.records = np.zeros(count, dtype=PERSON_DTYPE)
+        # record index of the person in every cell, -1 for an empty cell
+        self.index = np.full((n, n), -1, dtype=np.int64)
+
+    @classmethod
+    def from_grid(cls, grid):
+        """
+        copy the people of a grid into records, from its Person objects or from its layout if it has none
+        :param grid:  Grid object
+        """
+        if not grid.has_people:
+            return cls.from_layout(grid)
+        people = cls(grid.n, grid.L, len(grid.people_coords))
+        records = people.records
+        for k, (i, j) in enumerate(grid.people_coords):
+            person = grid.people_grid[i, j]
+            records[k] = (i, j, person.get_suspicion(), person.get_sum_of_suspicion(),
+                          person.generation, person.rumor_spreader, person.rumor_received, person.heard_rumor,
+                          person.rumor_spread)
+        people.index[records['i'], records['j']] = np.arange(len(records))
+        return people
+
+    @classmethod
+    def from_layout(cls, grid):
+        """
+        build the records of the people of a grid that has no Person objects, in their state after
+        create_rumor_spreader
+        :param grid:  Grid object
+        """
+        people = cls(grid.n, grid.L, len(grid.rows))
+        records = people.records
+        records['i'] = grid.rows
+        records['j'] = grid.cols
+        records['suspicion'] = grid.suspicion()
+        starters = np.asarray(grid.starters, dtype=np.int64)
+        records['sum_of_suspicion'][starters] = 1
+        for name in ('rumor_spreader', 'rumor_received', 'heard_rumor'):
+            records[name][starters] = True
+        people.index[records['i'], records['j']] = np.arange(len(records))
+        return people
+
+    def __len__(self):
+        return len(self.records)
@@ -0,0 +1,206 @@
+import time
+import tkinter as tk
+
+import numpy as np
+
+# fill color of the suspicion levels S4 - S1 a person is drawn in, by 3 * max(suspicion, sum of suspicion)
+COLORS = ('purple', 'green', 'blue', 'red')
+# how a person is drawn: with a question mark before they received the rumor, plain after and with wide edges while
+# spreading it
+QUIET, RECEIVED, SPREADING = 0, 1, 2
+# largest grid drawn with a rectangle per person by default, larger grids are drawn as one image
+CANVAS_LIMIT = 200
+
+
+def visual_state(state):
+    """
+    :param state:  dictionary of (n, n) arrays of the cells, see Simulation.cell_state
+    :return:  (n, n) array of how every cell is drawn, 0 for an empty cell and 1 + 3 * color + style for a person
+    """
+    level = np.rint(3 * np.maximum(state['suspicion'], state['sum_of_suspicion'])).astype(np.int8)
+    style = np.where(state['rumor_spread'], SPREADING, np.where(state['rumor_received'], RECEIVED, QUIET))
+    return np.where(state['occupied'], 1 + 3 * level + style, 0).astype(np.int8)
+
+
+def square_options(visual):
+    """
+    :param visual:  how a person is drawn, see visual_state
+    :return:  the canvas options of the square of the person
+    """
+    level, style = divmod(int(visual) - 1, 3)
+    return {'fill': COLORS[level],
+            'width': 3 if style == SPREADING else 1,
+            'stipple': 'questhead' if style == QUIET else ''}
+
+
+class CanvasRenderer:
+    """
+    draws a grid on a canvas with one rectangle per person. the rectangles are created the first time their person is
+    drawn and only the ones of the people who look different than in the last frame are configured again, so a frame
+    costs the number of people who changed instead of the size of the grid.
+    """
+
+    def __init__(self, canvas, n, size):
+        """
+        :param canvas:  canvas to draw on
+        :param n:  size of grid
+        :param size:  size of a cell on the canvas
+        """
+        self.canvas = canvas
+        self.n = n
+        self.size = size
+        # canvas item of every cell, 0 for a cell that has no rectangle yet
+        self.items = np.zeros((n, n), dtype=np.int64)
+        # how every cell was drawn in the last frame
+        self.shown = np.zeros((n, n), dtype=np.int8)
+
+    def draw(self, visual):
+        """
+        :param visual:  how every cell looks now, see visual_state
+        """
+        for cell in np.flatnonzero(visual != self.shown):
+            i, j = divmod(int(cell), self.n)
+            options = square_options(visual[i, j])
+            if self.items[i, j]:
+                self.canvas.itemconfigure(int(self.items[i, j]), **options)
+            else:
+                x, y = j * self.size, i * self.size
+                self.items[i, j] = self.canvas.create_rectangle(x, y, x + self.size, y + self.size, outline='black',
+                                                                **options)
+        self.shown = visual.copy()
+
+
+# RGB of the fill colors, the outlines and the background of the canvas
+RGB = {'purple': (160, 32, 240), 'green': (0, 255, 0), 'blue': (0, 0, 255), 'red': (255, 0, 0),
+       'black': (0, 0, 0), 'white': (255, 255, 255)}
+# the part of a cell a pixel is in, a pixel on the edge of its cell is drawn as the outline, a pixel in the band next
+# to the edge as the wide outline of a spreader and the stipple pixels as the question mark of a quiet person
+EDGE, BAND, STIPPLE = 4, 2, 1
+
+
+def pixel_palette():
+    """
+    :return:  (visual states, pixel roles, 3) array of the RGB of a pixel of every role in a cell drawn in every way
+    """
+    palette = np.empty((1 + 3 * len(COLORS), EDGE + BAND + STIPPLE + 1, 3), dtype=np.uint8)
+    palette[0] = RGB['white']
+    for visual in range(1, len(palette)):
+        level, style = divmod(visual - 1, 3)
+        for role in range(palette.shape[1]):
+            if role & EDGE or (role & BAND and style == SPREADING):
+                color = 'black'
+            elif style == QUIET and not role & STIPPLE:
+                color = 'white'
+            else:
+                color = COLORS[level]
+            palette[visual, role] = RGB[color]
+    return palette
+
+
+def pixel_cells(n, width):
+    """
+    :param n:  size of grid
+    :param width:  width of the image in pixels
+    :return:  (cells, distance) the cell every pixel along one side shows and its distance in pixels from the nearest
+              edge of that cell
+    """
+    pixels = np.arange(width)
+    cells = pixels * n // width
+    # the first pixel of every cell, and of the cell after the last one
+    starts = np.searchsorted(cells, np.arange(n + 1))
+    distance = np.minimum(pixels - starts[cells], starts[cells + 1] - 1 - pixels)
+    return cells, distance
+
+
+class ImageRenderer:
+    """
+    draws a grid as one image: every frame the visual state of the cells is painted into an RGB pixel buffer with a
+    color lookup per pixel and shown as a single PhotoImage, so a frame costs the number of pixels instead of the number
+    of people and grids far too large for one rectangle per person can be watched. the outlines and the question marks
+    are drawn as pixel patterns: the edges of the cells, a band inside the edges of the spreaders and a checkerboard
+    over the quiet people. the outlines are only drawn when a cell is at least 4 pixels wide.
+    """
+
+    def __init__(self, canvas, n, width):
+        """
+        :param canvas:  canvas to draw on
+        :param n:  size of grid
+        :param width:  width and height of the image in pixels
+        """
+        self.canvas = canvas
+        self.width = width
+        self.cells, distance = pixel_cells(n, width)
+        outlines = width >= 4 * n
+        edge = outlines & ((distance[:, None] == 0) | (distance[None, :] == 0))
+        band = outlines & ((distance[:, None] <= 1) | (distance[None, :] <= 1))
+        stipple = (np.arange(width)[:, None] + np.arange(width)[None, :]) % 2 == 0
+        self.roles = (edge * EDGE + band * BAND + stipple * STIPPLE).astype(np.intp)
+        self.palette = pixel_palette()
+        self.header = ('P6 ' + str(width) + ' ' + str(width) + ' 255\n').encode()
+        self.image = tk.PhotoImage(master=canvas, width=width, height=width)
+        self.item = canvas.create_image(0, 0, image=self.image, anchor='nw')
+
+    def paint(self, visual):
+        """
+        :param visual:  how every cell looks, see visual_state
+        :return:  (width, width, 3) RGB pixel buffer of the grid
+        """
+        return self.palette[visual[np.ix_(self.cells, self.cells)], self.roles]
+
+    def draw(self, visual):
+        """
+        :param visual:  how every cell looks now, see visual_state
+        """
+        self.image.configure(data=self.header + self.paint(visual).tobytes(), format='PPM')
+
+
+class StatBox:
+    """
+    the lines of a Text widget, rewritten only where they changed and at most once every interval seconds however fast
+    the generations go. the lines given in between are kept and shown by the next flush that is due.
+    """
+
+    def __init__(self, text, interval=0.25):
+        """
+        :param text:  Text widget to show the lines in
+        :param interval:  seconds between two updates of the widget
+        """
+        self.text = text
+        self.interval = interval
+        text.tag_configure('underline', underline=True)
+        # the (text, tags) of every line in the widget and of the lines waiting to be shown
+        self.shown = []
+        self.pending = None
+        self.last_update = None
+
+    def update(self, lines):
+        """
+        :param lines:  list of the (text, tags) of every line to show
+        """
+        self.pending = lines
+        self.flush()
+
+    def flush(self, force=False):
+        """
+        show the pending lines if the interval passed since the last update
+        :param force:  show them now
+        """
+        now = time.monotonic()
+        if self.pending is None or not force and self.last_update is not None and \
+                now - self.last_update < self.interval:
+            return
+        self.last_update = now
+        for number, line in enumerate(self.pending):
+            if number < len(self.shown) and self.shown[number] == line:
+                continue
+            text, tags = line
+            if number < len(self.shown):
+                start = str(number + 1) + '.0'
+                self.text.delete(start, start + ' lineend')
+                self.text.insert(start, text, tags)
+            else:
+                self.text.insert(tk.END, text + '\n', tags)
+        if len(self.pending) < len(self.shown):
+            self.text.delete(str(len(self.pending) + 1) + '.0', tk.END)
+        self.shown = self.pending
+        self.pending = None
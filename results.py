@@ -0,0 +1,243 @@
+import csv
+import os
+import time
+
+import numpy as np
+
+
+class ResultsWriter:
+    """
+    the single writer of the stats file. workers return the stats of a run to the parent process, which adds them
+    here, the rows are buffered and appended to the file in batches, so rows of different runs never interleave.
+    """
+
+    def __init__(self, path='stats.csv', batch_size=100, index_path=None, flush_every=30):
+        """
+        :param path:  csv file to append the rows to
+        :param batch_size:  number of rows to buffer before writing them to the file
+        :param index_path:  file to append the 'run id' of every written row to, None for no index
+        :param flush_every:  seconds after which buffered rows are written even if the batch is not full, so a killed
+                             sweep loses little work
+        """
+        self.path = path
+        self.index_path = index_path
+        self.batch_size = batch_size
+        self.flush_every = flush_every
+        self.last_flush = time.time()
+        self.rows = []
+        self.columns = None
+        # keep the columns of an existing file, so appended rows line up with its header
+        if os.path.isfile(path) and os.path.getsize(path) > 0:
+            with open(path, newline='') as file:
+                self.columns = next(csv.reader(file))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add(self, row):
+        """
+        :param row:  dictionary of column name to value for one run, None is written as an empty cell
+        """
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size or time.time() - self.last_flush >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """
+        append the buffered rows to the file
+        """
+        self.last_flush = time.time()
+        if not self.rows:
+            return
+        write_header = self.columns is None
+        if write_header:
+            self.columns = list(self.rows[0])
+            for row in self.rows[1:]:
+                self.columns += [column for column in row if column not in self.columns]
+        else:
+            # a column the header lacks would be lost while the index marks the run as done, so refuse to append
+            missing = [column for row in self.rows for column in row if column not in self.columns]
+            if missing:
+                raise ValueError(self.path + " has no column " + ", ".join(sorted(set(missing))) +
+                                 ", write the rows to a new stats file")
+        with open(self.path, 'a', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=self.columns)
+            if write_header:
+                writer.writeheader()
+            writer.writerows(self.rows)
+        # the ids go to the index only after their rows are in the file
+        if self.index_path is not None:
+            with open(self.index_path, 'a') as index:
+                index.writelines(row['run id'] + '\n' for row in self.rows)
+        self.rows = []
+
+    def close(self):
+        self.flush()
+
+
+def completed_runs(index_path):
+    """
+    :param index_path:  index file of a stats file
+    :return:  set of the ids of the runs already written to the stats file
+    """
+    if not os.path.exists(index_path):
+        return set()
+    with open(index_path) as index:
+        return {line.strip() for line in index if line.strip()}
+
+
+class ColumnarWriter(ResultsWriter):
+    """
+    writer of a columnar results store: a directory of .npz partitions, one per written batch, with a typed array for
+    every column and a mask of the runs that have no value in it, like a milestone the run never reached. load the
+    store back with load_results.
+    """
+
+    def __init__(self, path='stats', batch_size=10000, index_path=None, flush_every=30):
+        """
+        :param path:  directory of the store, a sweep writes its partitions there
+        :param batch_size:  number of rows to buffer before writing them as one partition
+        :param index_path:  file to append the 'run id' of every written row to, None for no index
+        :param flush_every:  seconds after which buffered rows are written even if the batch is not full
+        """
+        os.makedirs(path, exist_ok=True)
+        super().__init__(path, batch_size, index_path, flush_every)
+        # number the partitions after the ones already in the store, so appending never overwrites one
+        self.partitions = len(partition_files(path))
+
+    def flush(self):
+        """
+        write the buffered rows to a new partition of the store
+        """
+        self.last_flush = time.time()
+        if not self.rows:
+            return
+        names = []
+        for row in self.rows:
+            names += [name for name in row if name not in names]
+        arrays = {'columns': np.array(names)}
+        for name in names:
+            values, null = typed_column([row.get(name) for row in self.rows])
+            arrays['values:' + name] = values
+            arrays['null:' + name] = null
+        path = os.path.join(self.path, 'part_' + str(self.partitions).zfill(6) + '.npz')
+        # write to a temporary file first, so a killed sweep never leaves a partial partition in the store
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as file:
+            np.savez(file, **arrays)
+        os.replace(temporary, path)
+        self.partitions += 1
+        if self.index_path is not None:
+            with open(self.index_path, 'a') as index:
+                index.writelines(row['run id'] + '\n' for row in self.rows)
+        self.rows = []
+
+
+def typed_column(values):
+    """
+    :param values:  the value of a column for every row, None where the row has no value
+    :return:  (values, null) array of the values, with the narrowest type of bool, int64, float64 and str that holds
+              them all, and boolean array of the rows with no value
+    """
+    null = np.array([value is None for value in values], dtype=bool)
+    present = [value for value in values if value is not None]
+    booleans = [isinstance(value, (bool, np.bool_)) for value in present]
+    integers = [isinstance(value, (int, np.integer)) and -2 ** 63 <= value < 2 ** 63 for value in present]
+    if all(booleans):
+        dtype, fill = bool, False
+    elif all(integer and not boolean for integer, boolean in zip(integers, booleans)):
+        dtype, fill = np.int64, 0
+    elif all(isinstance(value, (float, np.floating)) or (integer and not boolean)
+             for value, integer, boolean in zip(present, integers, booleans)):
+        dtype, fill = np.float64, np.nan
+    else:
+        # a seed does not fit in 64 bits, it is kept as text like any other value so it is not rounded
+        return np.array(['' if value is None else str(value) for value in values]), null
+    return np.array([fill if value is None else value for value in values], dtype=dtype), null
+
+
+def partition_files(path):
+    """
+    :param path:  directory of a columnar results store
+    :return:  the partition files of the store, in the order they were written
+    """
+    if not os.path.isdir(path):
+        return []
+    return [os.path.join(path, name) for name in sorted(os.listdir(path))
+            if name.startswith('part_') and name.endswith('.npz')]
+
+
+def read_csv_columns(path):
+    """
+    :param path:  stats file written by ResultsWriter
+    :return:  dictionary of column name to (values, null), the values typed like typed_column from their text
+    """
+    with open(path, newline='') as file:
+        reader = csv.reader(file)
+        names = next(reader)
+        cells = list(reader)
+    columns = {}
+    for position, name in enumerate(names):
+        text = np.array([row[position] if position < len(row) else '' for row in cells])
+        null = text == ''
+        present = text[~null]
+        if np.isin(present, ('True', 'False')).all():
+            values = text == 'True'
+        else:
+            values = text
+            # integers too large for int64, like seeds, are kept as text instead of being rounded to floats
+            integral = np.char.isdigit(np.char.lstrip(present, '-')).all()
+            for dtype in (np.int64,) if integral else (np.int64, np.float64):
+                try:
+                    converted = present.astype(dtype)
+                except (ValueError, OverflowError):
+                    continue
+                values = np.zeros(len(text), dtype=dtype)
+                values[~null] = converted
+                break
+        columns[name] = (values, null)
+    return columns
+
+
+def read_partition(path):
+    """
+    :param path:  partition of a columnar results store
+    :return:  dictionary of column name to (values, null)
+    """
+    with np.load(path) as partition:
+        return {str(name): (partition['values:' + name], partition['null:' + name]) for name in partition['columns']}
+
+
+def load_results(*paths):
+    """
+    load the runs of results stores and stats files into one table, a column some of them don't have is null for
+    their runs
+    :param paths:  directories of columnar results stores or .csv stats files, like the stores of several sweeps
+    :return:  dictionary of column name to a numpy masked array of the values of every run, masked where the run has
+              no value
+    """
+    parts = []
+    for path in paths:
+        if path.endswith('.csv'):
+            parts.append(read_csv_columns(path))
+        else:
+            parts += [read_partition(partition) for partition in partition_files(path)]
+    names = []
+    for part in parts:
+        names += [name for name in part if name not in names]
+    lengths = [len(next(iter(part.values()))[0]) if part else 0 for part in parts]
+    table = {}
+    for name in names:
+        present = [part[name][0] for part in parts if name in part]
+        if any(array.dtype.kind == 'U' for array in present):
+            # a column typed as text in one part and as numbers in another is kept as text
+            present = [array.astype(str) for array in present]
+        dtype = np.result_type(*present)
+        values = [part[name][0].astype(dtype) if name in part else np.zeros(length, dtype=dtype)
+                  for part, length in zip(parts, lengths)]
+        null = [part[name][1] if name in part else np.ones(length, dtype=bool) for part, length in zip(parts, lengths)]
+        table[name] = np.ma.masked_array(np.concatenate(values), mask=np.concatenate(null))
+    return table
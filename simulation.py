@@ -0,0 +1,854 @@
+import copy
+import numpy as np
+from checkpoint import read_meta, restore_checkpoint, save_checkpoint
+from stats import MilestoneTracker
+from engine import ENGINES, BatchEngine, GraphEngine
+from history import HistoryRecorder
+from layouts import Layout, cached_layout, layout_key, load_graph, neighbor_lists, spiral_path
+
+
+# the probability of believing a rumor for each suspicion level S1 - S4
+SUSPICION_LEVELS = {1: 1, 2: 2 / 3, 3: 1 / 3, 4: 0}
+# the arrays of a cell the GUI draws it from
+CELL_FIELDS = ('occupied', 'suspicion', 'sum_of_suspicion', 'rumor_received', 'rumor_spread')
+# engine of the replicates of a BatchSimulation, which have no engine of their own, only BatchSimulation passes it
+_REPLICATE = object()
+
+
+class Simulation:
+    """
+    a run of the rumor spreading simulation, without any graphics. research runs use it directly and the GUI of the
+    simulator mode draws on top of it.
+    """
+
+    def __init__(self, params, engine="object", layout="random", milestones=(25, 50, 75), stop_early=True,
+                 fast_forward=False, seed=None, layout_seed=None, layout_cache=None, topology="moore", checkpoint=None,
+                 checkpoint_every=100, history=None, history_frames=False):
+        """
+        :param params:  list of parameters [n, P, S1, S2, S3, L, generation limit]
+        :param engine:  "object" to step every Person object, "vector" to step the whole grid with numpy arrays,
+                        "frontier" to only step the people on the rumor front, "compiled" to step every person in a
+                        loop compiled with numba, "graph" to step the people over a neighbor graph of any topology.
+                        see BatchSimulation to run replicates together on a BatchEngine
+        :param layout:  "random" to place people with probability P, "spiral" for the spiral of part 2
+        :param milestones:  percents of people who received the rumor to record the generation of
+        :param stop_early:  stop the run once the rumor died out or everyone received it, the stats can't change anymore
+        :param fast_forward:  when the rumor died out, jump the grid to the generation limit instead of stepping or
+                              stopping there
+        :param seed:  seed of the run, the same seed and parameters always give the same run. None for a fresh seed,
+                      which is still recorded in the stats so the run can be replayed
+        :param layout_seed:  seed of the random layout, runs with the same layout seed, n, P and S1 - S3 get the same
+                             layout whatever their L and seed. None to use the seed, a run is its own layout seed
+        :param layout_cache:  directory to keep the layouts in, None to build them every time. a random layout is only
+                              kept for a seeded run, the spiral only depends on n
+        :param topology:  neighborhood of a cell, see layouts.TOPOLOGIES. only the graph engine supports another
+                          neighborhood than "moore"
+        :param checkpoint:  directory to checkpoint the array engine to, None for no checkpoints. a run with the same
+                            parameters and seed continues from the last checkpoint in the directory
+        :param checkpoint_every:  number of generations between two checkpoints
+        :param history:  .npz file to record the aggregates of every generation to, None to not record them. see
+                         history.HistoryRecorder, the object engine only keeps the count of people who received the
+                         rumor, so its other aggregates are recorded as -1
+        :param history_frames:  also record a bit-packed frame of the state of every generation, array engines only
+        """
+        if engine is not _REPLICATE and engine != "object" and engine not in ENGINES:
+            raise ValueError("unknown engine " + str(engine) + ", use object or one of " + ", ".join(ENGINES))
+        if topology != "moore" and engine != "graph":
+            raise ValueError("the " + engine + " engine only supports the moore neighborhood, not " + topology)
+        self.generation_50 = None
+        self.generation_25 = None
+        self.generation_75 = None
+
+        # a run continued from a checkpoint must be the run that was checkpointed, a run without a seed takes the
+        # seed of the checkpoint so the seed in its stats still replays it
+        meta = None if checkpoint is None else read_meta(checkpoint)
+        if meta is not None:
+            stored = meta['extra']
+            if not isinstance(stored, dict) or not {'milestones', 'params', 'seed', 'layout_seed'} <= set(stored):
+                raise ValueError("checkpoint in " + checkpoint + " was not written by a Simulation, it has no "
+                                 "milestones, parameters and seeds to continue the run from")
+            if list(params) != stored['params']:
+                raise ValueError("checkpoint in " + checkpoint + " is of a run with parameters " +
+                                 str(stored['params']) + ", not " + str(list(params)))
+            if seed is None:
+                seed = stored['seed']
+            elif np.random.SeedSequence(seed).entropy != stored['seed']:
+                raise ValueError("checkpoint in " + checkpoint + " is of a run with seed " + str(stored['seed']) +
+                                 ", not " + str(seed))
+            if layout_seed is None:
+                layout_seed = stored['layout_seed']
+            elif np.random.SeedSequence(layout_seed).entropy != stored['layout_seed']:
+                raise ValueError("checkpoint in " + checkpoint + " is of a run with layout seed " +
+                                 str(stored['layout_seed']) + ", not " + str(layout_seed))
+        # the layout, the spreading and the choice of the rumor starters draw from independent streams, so every
+        # engine gets the same grid for a seed and a layout loaded from the cache gets the same starters
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.seed = self.seed_sequence.entropy
+        layout_stream, spread_seed, starter_seed = self.seed_sequence.spawn(3)
+        if layout_seed is not None:
+            # the first stream a layout seed spawns, the same as the layout stream of a run seeded with it
+            layout_stream = np.random.SeedSequence(layout_seed).spawn(1)[0]
+        self.layout_seed = layout_stream.entropy
+        self.rng = np.random.default_rng(spread_seed)
+
+        # create grid, the array engines build their state from the layout without Person objects
+        people = engine == "object"
+        self.params = params
+        self.grid = Grid(params[0], params[1], params[2], params[3], params[4], np.random.default_rng(layout_stream))
+        self.L_params = params[5]
+        load_layout(self.grid, layout, self.L_params, seed if layout_seed is None else layout_seed, layout_cache,
+                    people)
+        # create rumor spreaders
+        self.grid.create_rumor_spreader(np.random.default_rng(starter_seed))
+        self.milestones = MilestoneTracker(len(self.grid.rows), milestones)
+        # create the array engine from the grid
+        self.engine = None
+        if engine == "graph":
+            self.engine = GraphEngine.from_grid(self.grid, self.L_params, self.rng, topology)
+        elif engine in ENGINES:
+            self.engine = ENGINES[engine].from_grid(self.grid, self.L_params, self.rng)
+        # set generation limit
+        self.generation_limit = params[6]
+        self.stop_early = stop_early
+        self.fast_forward = fast_forward
+        self.terminal_generation = None
+        self.percent_received = 0
+        self.stats = None
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.resumed = False
+        self.history = None if history is None else HistoryRecorder(history, history_frames)
+        if checkpoint is not None:
+            if self.engine is None:
+                raise ValueError("only the array engines can be checkpointed, not the " + engine + " engine")
+            if meta is not None:
+                extra = restore_checkpoint(self.engine, checkpoint)
+                self.milestones.set_state(extra['milestones'])
+                # a checkpoint of the last generation is not stepped again, so the stats come from the tracker
+                self.read_milestones()
+                self.grid.generation = self.engine.generation
+                self.resumed = True
+
+    def run(self):
+        """
+        spread the rumor and run the simulation to the end, or continue it from its checkpoint
+        :return:  the stats of the run
+        """
+        if not self.resumed:
+            self.spread_rumor()
+        self.skip_to_end()
+        if self.history is not None:
+            self.history.close()
+        self.stats = self.get_stats()
+        return self.stats
+
+    def spread_rumor(self):
+        """
+        let the rumor starters spread the rumor
+        """
+        if self.engine is not None:
+            self.engine.spread_rumor()
+        else:
+            self.grid.spread_rumor(self.rng)
+
+    def skip_to_end(self, progress=None):
+        """
+        Skip to the end of the game.
+        :param progress:  function called with the generation after every generation, to report the progress of the run
+        """
+        while self.grid.generation < self.generation_limit:
+            self.update_stats()
+            if self.history is not None:
+                self.record_history()
+            if self.stop_early and self.is_finished():
+                break
+            if self.fast_forward and self.is_quiescent():
+                # the generations left can't change anything, the grid jumps over them below
+                break
+            self.next_generation()
+            if self.checkpoint is not None and self.grid.generation % self.checkpoint_every == 0:
+                self.write_checkpoint()
+            if progress is not None:
+                progress(self.grid.generation)
+        self.terminal_generation = self.grid.generation
+        if self.checkpoint is not None:
+            self.write_checkpoint()
+        if self.fast_forward and self.is_quiescent():
+            # nothing changes from here on, so the last generation looks the same as this one
+            if self.engine is not None:
+                self.engine.fast_forward(self.generation_limit)
+            else:
+                self.grid.fast_forward()
+            self.grid.generation = self.generation_limit
+
+    def record_history(self):
+        """
+        record the aggregates of the current generation in the history of the run
+        """
+        if self.engine is not None:
+            self.history.record_engine(self.grid.generation, self.percent_received, self.engine)
+        else:
+            self.history.record(self.grid.generation, self.percent_received, self.grid.received_count, -1, -1,
+                                [-1] * 4)
+
+    def write_checkpoint(self):
+        """
+        checkpoint the engine, the milestones reached so far and the parameters and seeds of the run
+        """
+        save_checkpoint(self.engine, self.checkpoint, {'milestones': self.milestones.get_state(),
+                                                       'params': list(self.params),
+                                                       'seed': self.seed,
+                                                       'layout_seed': self.layout_seed})
+
+    def is_quiescent(self):
+        """
+        :return:  True if nobody heard the rumor and nobody is spreading it
+        """
+        if self.engine is not None:
+            return self.engine.is_quiescent()
+        return self.grid.is_quiescent()
+
+    def is_finished(self):
+        """
+        :return:  True if the rumor died out or everyone received it, in both cases the stats stay the same
+        """
+        return self.is_quiescent() or self.milestones.percent_received == 100
+
+    def get_stats(self):
+        """
+        :return:  the stats of the run as a row of the stats file, with the parameters, the generations the
+                  25%, 50% and 75% milestones were reached in and the final percentile
+        """
+        data = {'L value': self.L_params,
+                'P value': self.grid.p,
+                'S1 value': self.grid.s1,
+                'S2 value': self.grid.s2,
+                'S3 value': self.grid.s3,
+                'S4 value': round(1 - self.grid.s1 - self.grid.s2 - self.grid.s3, 2),
+                '25 percentile': self.generation_25,
+                '50 percentile': self.generation_50,
+                '75 percentile': self.generation_75,
+                'final percentile': self.percent_received,
+                'terminal generation': self.terminal_generation,
+                'seed': self.seed,
+                'layout seed': self.layout_seed}
+        # any milestone other than 25%, 50% and 75% gets its own column
+        for milestone in self.milestones.milestones:
+            if milestone not in (25, 50, 75):
+                data[str(milestone) + ' percentile'] = self.milestones.generation_of(milestone)
+        return data
+
+    def generation(self):
+        """
+        copy the state of the people grid into the back buffer and iterate over it to create the next generation
+        """
+        back_grid = self.grid.back_buffer()
+        for i, j in self.grid.people_coords:
+            back_grid[i, j].copy_state(self.grid.people_grid[i, j])
+        for (i, j), neighbors in zip(self.grid.people_coords, self.grid.neighbor_cells()):
+            self.grid.received_count += self.grid.people_grid[i, j].spread(back_grid, self.grid.n, self.rng, neighbors)
+        return back_grid
+
+    def next_generation(self):
+        """
+        create next generation of people
+        """
+        if self.engine is not None:
+            self.engine.step()
+        else:
+            self.generation()
+            self.grid.swap_buffers()
+        self.grid.generation += 1
+
+    def received_count(self):
+        """
+        :return:  the number of people who received the rumor, from the count the engine keeps up to date
+        """
+        if self.engine is not None:
+            return self.engine.received_count()
+        return self.grid.received_count
+
+    def cell_state(self):
+        """
+        :return:  dictionary of (n, n) arrays of whether every cell is occupied and the suspicion, sum of suspicion,
+                  rumor received and rumor spread of the person in it, for drawing the grid
+        """
+        n = self.grid.n
+        if self.engine is not None and hasattr(self.engine, 'occupied'):
+            # the grid engines pad their arrays with an empty border
+            return {name: getattr(self.engine, name)[1:-1, 1:-1] for name in CELL_FIELDS}
+        state = {name: np.zeros((n, n), dtype=bool if name in ('occupied', 'rumor_received', 'rumor_spread')
+                                else np.float64) for name in CELL_FIELDS}
+        rows, cols = np.asarray(self.grid.rows), np.asarray(self.grid.cols)
+        state['occupied'][rows, cols] = True
+        if self.engine is not None:
+            for name in CELL_FIELDS[1:]:
+                state[name][rows, cols] = getattr(self.engine, name)
+        else:
+            for i, j in zip(rows, cols):
+                person = self.grid.people_grid[i, j]
+                state['suspicion'][i, j] = person.get_suspicion()
+                state['sum_of_suspicion'][i, j] = person.get_sum_of_suspicion()
+                state['rumor_received'][i, j] = person.rumor_received
+                state['rumor_spread'][i, j] = person.rumor_spread
+        return state
+
+    def update_stats(self, received=None):
+        """
+        update the percent of people who received the rumor and the milestones for the current generation
+        :param received:  number of people who received the rumor, by default the count of the engine of the run
+        """
+        if received is None:
+            received = self.received_count()
+        self.milestones.update(received, self.grid.generation)
+        self.read_milestones()
+
+    def read_milestones(self):
+        """
+        copy the percent of people who received the rumor and the milestones reached from the milestone tracker
+        """
+        self.percent_received = self.milestones.percent_received
+
+        # the generations the population reached 25%, 50% and 75% rumor received
+        self.generation_25 = self.milestones.generation_of(25)
+        self.generation_50 = self.milestones.generation_of(50)
+        self.generation_75 = self.milestones.generation_of(75)
+
+
+def draw_groups(count, s1, s2, s3, rng):
+    """
+    :param count:  number of people
+    :param s1:  probability of group 1
+    :param s2:  probability of group 2
+    :param s3:  probability of group 3, the rest are in group 4
+    :param rng:  numpy random generator to draw with
+    :return:  suspicion group 1 - 4 of every person
+    """
+    # group g is drawn when the draw is at least S1 + ... + S(g - 1) and below S1 + ... + Sg
+    thresholds = np.cumsum([s1, s2, s3])
+    return np.searchsorted(thresholds, rng.random(count), side='right') + 1
+
+
+def run_graph(path, s1, s2, s3, L, generation_limit, milestones=(25, 50, 75), seed=None, directed=False,
+              history=None, history_frames=False):
+    """
+    run the rumor model on a loaded graph, like a social network, instead of a grid. the people are the nodes of the
+    graph and their neighbors the nodes they share an edge with.
+    :param path:  edge list file of the graph, see layouts.load_graph
+    :param s1:  probability of suspicion group 1
+    :param s2:  probability of suspicion group 2
+    :param s3:  probability of suspicion group 3
+    :param L:  number of generations a person waits before spreading the rumor again
+    :param generation_limit:  generation limit of the run
+    :param milestones:  percents of people who received the rumor to record the generation of
+    :param seed:  seed of the run, see Simulation
+    :param directed:  only the source of an edge tells the target
+    :param history:  .npz file to record the aggregates of every generation to, see Simulation
+    :param history_frames:  also record a frame of the state of every generation
+    :return:  the stats of the run
+    """
+    seed_sequence = np.random.SeedSequence(seed)
+    layout_rng, rng, starter_rng = [np.random.default_rng(child) for child in seed_sequence.spawn(3)]
+    count, indptr, indices = load_graph(path, directed)
+    groups = draw_groups(count, s1, s2, s3, layout_rng)
+    starters = [members[starter_rng.integers(len(members))] for members in
+                (np.flatnonzero(groups == group) for group in range(1, 5))]
+    engine = GraphEngine.from_graph(indptr, indices, groups, starters, L, rng)
+    tracker = MilestoneTracker(count, milestones)
+    recorder = None if history is None else HistoryRecorder(history, history_frames)
+    engine.spread_rumor()
+    while engine.generation < generation_limit:
+        tracker.update(engine.received_count(), engine.generation)
+        if recorder is not None:
+            recorder.record_engine(engine.generation, tracker.percent_received, engine)
+        if engine.is_quiescent() or tracker.percent_received == 100:
+            break
+        engine.step()
+    if recorder is not None:
+        recorder.close()
+    data = {'L value': L,
+            'S1 value': s1,
+            'S2 value': s2,
+            'S3 value': s3,
+            'S4 value': round(1 - s1 - s2 - s3, 2),
+            'people': count,
+            'edges': len(indices)}
+    for milestone in tracker.milestones:
+        data[str(milestone) + ' percentile'] = tracker.generation_of(milestone)
+    data['final percentile'] = tracker.percent_received
+    data['terminal generation'] = engine.generation
+    data['seed'] = seed_sequence.entropy
+    return data
+
+
+def load_layout(grid, layout, L, seed=None, cache_dir=None, people=True):
+    """
+    create the layout of a grid, or load it from the layout cache when it is deterministic
+    :param grid:  Grid object to create the layout of
+    :param layout:  "random" or "spiral", see Simulation
+    :param L:  L parameter of the people
+    :param seed:  layout seed of the run, a random layout is only cached for a seeded run
+    :param cache_dir:  directory of the layout cache, None to not cache the layout
+    :param people:  also create the Person objects
+    """
+    if cache_dir is None or (layout != "spiral" and seed is None):
+        grid.create_layout(layout, L, people)
+        return
+
+    def build():
+        grid.create_layout(layout, L, people=False)
+        return grid.get_layout()
+
+    key = layout_key(grid.n, layout, grid.p, grid.s1, grid.s2, grid.s3, seed)
+    grid.use_layout(cached_layout(key, grid.n, build, cache_dir), L, people)
+
+
+class BatchSimulation:
+    """
+    replicates of one configuration run together by a BatchEngine. every replicate is a Simulation with its own seed,
+    which holds its grid and stats, and gives the same result as Simulation(params, engine="vector", seed=seed).
+    """
+
+    def __init__(self, params, seeds, layout="random", milestones=(25, 50, 75), stop_early=True, layout_seeds=None,
+                 layout_cache=None, histories=None, history_frames=False):
+        """
+        :param params:  list of parameters [n, P, S1, S2, S3, L, generation limit]
+        :param seeds:  seed of every replicate
+        :param layout:  "random" to place people with probability P, "spiral" for the spiral of part 2
+        :param milestones:  percents of people who received the rumor to record the generation of
+        :param stop_early:  stop a replicate once the rumor died out or everyone received it, the batch stops once
+                            every replicate stopped
+        :param layout_seeds:  layout seed of every replicate, see Simulation. None to use the seeds
+        :param layout_cache:  directory to keep the random layouts of the replicates in, see Simulation
+        :param histories:  .npz file to record the history of every replicate to, None to not record them
+        :param history_frames:  also record a frame of the state of every generation, see Simulation
+        """
+        histories = histories or [None] * len(seeds)
+        layout_seeds = layout_seeds or [None] * len(seeds)
+        self.simulations = [Simulation(params, engine=_REPLICATE, layout=layout, milestones=milestones,
+                                       stop_early=stop_early, seed=seed, layout_seed=layout_seed,
+                                       layout_cache=layout_cache, history=history, history_frames=history_frames)
+                            for seed, layout_seed, history in zip(seeds, layout_seeds, histories)]
+        self.L_params = params[5]
+        self.generation_limit = params[6]
+        self.stop_early = stop_early
+        self.engine = BatchEngine.from_grids([simulation.grid for simulation in self.simulations], self.L_params,
+                                             [simulation.rng for simulation in self.simulations])
+        self.generation = 0
+
+    def run(self):
+        """
+        spread the rumor and run every replicate to the end
+        :return:  list of the stats of every replicate
+        """
+        self.engine.spread_rumor()
+        # the replicates still in the engine, in the order of the engine
+        running = list(range(len(self.simulations)))
+        while self.generation < self.generation_limit:
+            quiescent = self.engine.quiescent()
+            keep = []
+            for index, replicate in enumerate(running):
+                simulation = self.simulations[replicate]
+                simulation.grid.generation = self.generation
+                simulation.update_stats(int(self.engine.received[index]))
+                if simulation.history is not None:
+                    simulation.history.record_engine(self.generation, simulation.percent_received, self.engine, index)
+                if self.stop_early and (quiescent[index] or simulation.percent_received == 100):
+                    simulation.terminal_generation = self.generation
+                else:
+                    keep.append(index)
+            if not keep:
+                break
+            if len(keep) < len(running):
+                self.engine.keep(keep)
+                running = [running[index] for index in keep]
+            self.engine.step()
+            self.generation += 1
+        for replicate in running:
+            self.simulations[replicate].grid.generation = self.generation
+            self.simulations[replicate].terminal_generation = self.generation
+        for simulation in self.simulations:
+            if simulation.history is not None:
+                simulation.history.close()
+        return [simulation.get_stats() for simulation in self.simulations]
+
+
+class Grid:
+    """
+    class that creates a grid of people and assigns suspicion levels to each person
+    """
+
+    def __init__(self, n, p, distribution_of_group_1, distribution_of_group_2, distribution_of_group_3, rng=None):
+        """
+        :param n: size of grid
+        :param p: probability of a person existing in a cell
+        :param distribution_of_group_1:  distribution of suspicion levels for group 1
+        :param distribution_of_group_2: distribution of suspicion levels for group 2
+        :param distribution_of_group_3: distribution of suspicion levels for group 3
+        :param rng:  numpy random generator used to place the people and choose the rumor spreaders
+        """
+        self.n = n
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.p = p
+        self.s1 = distribution_of_group_1
+        self.s2 = distribution_of_group_2
+        self.s3 = distribution_of_group_3
+        self.L = None
+        # suspicion group of the person in every cell, 0 for an empty cell
+        self.group_grid = np.zeros((n, n), dtype=np.int8)
+        # row, column and suspicion group of every person, in processing order
+        self.rows = np.empty(0, dtype=np.int64)
+        self.cols = np.empty(0, dtype=np.int64)
+        self.groups = np.empty(0, dtype=np.int8)
+        # people placed by spiral_grid, in the order of the spiral
+        self.spiral_coords = np.empty((0, 2), dtype=np.int64)
+        # index of the people of each suspicion group 1 - 4, in processing order
+        self.group_index = {}
+        # index of the rumor starter of each group
+        self.starters = []
+        # Layout of the people, made when it is first needed
+        self.layout = None
+        # (row, column) of the neighbors of every person, for the object engine
+        self.neighbor_coords = None
+        # Person objects and their (row, column) in processing order, only created for the object engine and the GUI
+        self.has_people = False
+        self.people_grid = np.empty((n, n), dtype=object)
+        self.people_coords = []
+        # create rumor spreaders
+        self.rumor_spreader_1 = None
+        self.rumor_spreader_2 = None
+        self.rumor_spreader_3 = None
+        self.rumor_spreader_4 = None
+        # number of people who received the rumor, kept up to date as people receive it
+        self.received_count = 0
+        # second people grid the next generation is written into
+        self.back_grid = None
+        # generation counter
+        self.generation = 0
+
+    def create_layout(self, layout, L, people=True):
+        """
+        :param layout:  "random" to place people with probability P, "spiral" for the spiral of part 2
+        :param L:  L parameter of the people
+        :param people:  also create the Person objects
+        """
+        if layout == "spiral":
+            self.spiral_grid(0, 0, self.n, "right", L)
+            self.fill_grid(L, people)
+        else:
+            self.create_grid(L, people)
+
+    def use_layout(self, layout, L, people=True):
+        """
+        :param layout:  Layout to place the people of
+        :param L:  L parameter of the people
+        :param people:  also create the Person objects
+        """
+        self.set_layout(layout.rows, layout.cols, layout.groups, L, people)
+        self.layout = layout
+
+    def get_layout(self):
+        """
+        :return:  the Layout of the people, with the lists of their neighbors
+        """
+        if self.layout is None:
+            self.layout = Layout(self.n, self.rows, self.cols, self.groups)
+        return self.layout
+
+    def neighbor_graph(self, topology="moore"):
+        """
+        :param topology:  neighborhood of a cell, see layouts.TOPOLOGIES
+        :return:  (indptr, indices) CSR list of the neighbors of every person, in processing order
+        """
+        if topology == "moore":
+            layout = self.get_layout()
+            return layout.indptr, layout.indices
+        return neighbor_lists(self.n, self.rows, self.cols, topology)
+
+    def neighbor_cells(self):
+        """
+        :return:  for every person in processing order, the list of (row, column) of the neighbors who live in the
+                  grid, so Person.spread does not need to check the bounds of the grid
+        """
+        if self.neighbor_coords is None:
+            layout = self.get_layout()
+            cells = list(zip(layout.rows[layout.indices].tolist(), layout.cols[layout.indices].tolist()))
+            indptr = layout.indptr.tolist()
+            self.neighbor_coords = [cells[indptr[k]:indptr[k + 1]] for k in range(len(indptr) - 1)]
+        return self.neighbor_coords
+
+    def create_grid(self, L, people=True):
+        """
+        create grid of people, every cell gets a person with probability p and every person a suspicion group drawn
+        with the probabilities S1 - S4
+        :param L:  L parameter of the people
+        :param people:  also create the Person objects, the array engines only need the layout
+        """
+        occupied = self.rng.random((self.n, self.n)) < self.p
+        rows, cols = np.nonzero(occupied)
+        groups = draw_groups(len(rows), self.s1, self.s2, self.s3, self.rng)
+        self.set_layout(rows, cols, groups, L, people)
+
+    def set_layout(self, rows, cols, groups, L, people=True):
+        """
+        :param rows:  row of every person, in processing order
+        :param cols:  column of every person, in processing order
+        :param groups:  suspicion group 1 - 4 of every person
+        :param L:  L parameter of the people
+        :param people:  also create the Person objects
+        """
+        self.L = L
+        self.layout = None
+        self.neighbor_coords = None
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.cols = np.asarray(cols, dtype=np.int64)
+        self.groups = np.asarray(groups, dtype=np.int8)
+        self.group_grid[self.rows, self.cols] = self.groups
+        self.group_index = {group: np.flatnonzero(self.groups == group) for group in range(1, 5)}
+        if people:
+            self.create_people()
+
+    def create_people(self):
+        """
+        create a Person object for every person of the layout
+        """
+        self.people_coords = list(zip(self.rows.tolist(), self.cols.tolist()))
+        for (i, j), group in zip(self.people_coords, self.groups.tolist()):
+            self.people_grid[i, j] = Person(i, j, self.L)
+            self.people_grid[i, j].set_suspicion(group)
+        self.has_people = True
+
+    def suspicion(self):
+        """
+        :return:  suspicion level of every person, in processing order
+        """
+        levels = np.array([0] + [SUSPICION_LEVELS[group] for group in range(1, 5)])
+        return levels[self.groups]
+
+    def spiral_grid(self, x, y, length, direction, L):
+        """
+        place S4 people on every other cell of a spiral, the cells in between stay empty
+        :param x:  row to start from
+        :param y:  column to start from
+        :param length:  length of the first side of the spiral
+        :param direction:  direction of the first side
+        :param L:  L parameter of the people, they are created by fill_grid
+        """
+        path = spiral_path(x, y, length, direction)
+        self.spiral_coords = path[0::2]
+        self.group_grid[path[0::2, 0], path[0::2, 1]] = 4
+        # mark the empty cells of the spiral, so fill_grid skips them
+        self.group_grid[path[1::2, 0], path[1::2, 1]] = -1
+
+    def fill_grid(self, L, people=True):
+        """
+        fill the cells the spiral did not reach with people of groups S1, S2 and S3 in turn, in row-major order
+        :param L:  L parameter of the people
+        :param people:  also create the Person objects, the array engines only need the layout
+        """
+        spiral = self.spiral_coords
+        fill_rows, fill_cols = np.nonzero(self.group_grid == 0)
+        self.group_grid[self.group_grid == -1] = 0
+        # the people of the spiral come first in processing order
+        rows = np.concatenate([spiral[:, 0], fill_rows])
+        cols = np.concatenate([spiral[:, 1], fill_cols])
+        groups = np.concatenate([np.full(len(spiral), 4), np.arange(len(fill_rows)) % 3 + 1])
+        self.set_layout(rows, cols, groups, L, people)
+
+    def create_rumor_spreader(self, rng=None):
+        """
+        select a random person from each group to be the rumor spreader and set their suspicion level to 1
+        :param rng:  numpy random generator to choose with, by default the one of the grid
+        """
+        rng = self.rng if rng is None else rng
+        # select a random person from each group to be the rumor spreader
+        self.starters = [int(members[rng.integers(len(members))]) for members in self.group_index.values()]
+        if self.has_people:
+            spreaders = [self.people_grid[self.rows[k], self.cols[k]] for k in self.starters]
+            self.rumor_spreader_1, self.rumor_spreader_2, self.rumor_spreader_3, self.rumor_spreader_4 = spreaders
+            for spreader in spreaders:
+                spreader.rumor_starter()
+        self.received_count += 4
+
+    def spread_rumor(self, rng):
+        """
+        spread rumor to neighbors
+        :param rng:  numpy random generator used for the spread draws
+        """
+        # spread rumor to neighbors
+        self.received_count += self.rumor_spreader_1.spread(self.people_grid, self.n, rng)
+        self.received_count += self.rumor_spreader_2.spread(self.people_grid, self.n, rng)
+        self.received_count += self.rumor_spreader_3.spread(self.people_grid, self.n, rng)
+        self.received_count += self.rumor_spreader_4.spread(self.people_grid, self.n, rng)
+
+    def is_quiescent(self):
+        """
+        :return:  True if nobody heard the rumor and nobody is spreading it, a person still waiting for L generations
+                  to pass does not change until they hear the rumor again
+        """
+        for i, j in self.people_coords:
+            if self.people_grid[i, j].heard_rumor or self.people_grid[i, j].rumor_spread:
+                return False
+        return True
+
+    def fast_forward(self):
+        """
+        clear the spreading marks, the only thing later generations change in a quiescent grid
+        """
+        for i, j in self.people_coords:
+            self.people_grid[i, j].rumor_spread = False
+
+    def back_buffer(self):
+        """
+        return the second people grid, creating it the first time with a person in the same cells as the people grid
+        """
+        if self.back_grid is None:
+            self.back_grid = self.people_grid.copy()
+            for i, j in self.people_coords:
+                self.back_grid[i, j] = copy.copy(self.people_grid[i, j])
+        return self.back_grid
+
+    def swap_buffers(self):
+        """
+        make the back buffer the current people grid, the old people grid becomes the next back buffer
+        """
+        self.people_grid, self.back_grid = self.back_grid, self.people_grid
+
+    def get_generation(self):
+        return self.generation
+
+
+class Person:
+    """
+    class that creates a person object
+    """
+
+    # fixed attributes instead of a per person __dict__, grids hold up to millions of people
+    __slots__ = ('__i', '__j', '__L', 'rumor_spreader', 'rumor_received', 'heard_rumor', 'rumor_spread',
+                 '__sum_of_suspicion', '__suspicion', 'generation')
+
+    def __init__(self, i, j, L):
+        """
+        :param i: x coordinate of person
+        :param j: y coordinate of person
+        """
+        self.__i = i
+        self.__j = j
+        self.__L = L
+        self.rumor_spreader = False
+        self.rumor_received = False
+        self.heard_rumor = False
+        self.rumor_spread = False
+        self.__sum_of_suspicion = 0
+        self.__suspicion = 0
+        self.generation = 0
+
+    def get_sum_of_suspicion(self):
+        return self.__sum_of_suspicion
+
+    def get_location(self):
+        return self.__i, self.__j
+
+    def get_L(self):
+        return self.__L
+
+    def start_generation(self):
+        self.generation += self.__L
+
+    def get_suspicion(self):
+        return self.__suspicion
+
+    def copy_state(self, other):
+        """
+        copy the rumor state of another person at the same location
+        :param other:  the person to copy from
+        """
+        self.rumor_spreader = other.rumor_spreader
+        self.rumor_received = other.rumor_received
+        self.heard_rumor = other.heard_rumor
+        self.rumor_spread = other.rumor_spread
+        self.__sum_of_suspicion = other.__sum_of_suspicion
+        self.__suspicion = other.__suspicion
+        self.generation = other.generation
+
+    def rumor_starter(self):
+        """
+        function for when a person is chosen to start a rumor.
+        set suspicion level to 1 and set rumor_spreader to True
+        """
+        self.__sum_of_suspicion = 1
+        self.rumor_spreader = True
+        self.rumor_received = True
+        self.heard_rumor = True
+
+    def set_suspicion(self, suspicion_level):
+        """
+        :param suspicion_level: the suspicion level to be assigned to the person
+        """
+        self.__suspicion = SUSPICION_LEVELS[suspicion_level]
+
+    def receive_rumor(self):
+        """
+        function for when a person receives a rumor
+        :return:  True if it is the first time the person received the rumor
+        """
+        first_time = not self.rumor_received
+        self.rumor_received = True
+        self.heard_rumor = True
+        self.belief_increase()
+        return first_time
+
+    def belief_increase(self):
+        """
+        function for when a person receives a rumor
+        """
+        # raise the sum of suspicion by the suspicion level of the person who spread the rumor, if sum of suspicion
+        # is more than 1, set it to 1
+        self.__sum_of_suspicion += self.__suspicion
+        if self.__sum_of_suspicion > 1:
+            self.__sum_of_suspicion = 1
+
+    def spread(self, grid, n, rng, neighbors=None):
+        """
+        spread rumor to neighbor
+        :param grid:  the grid of people
+        :param n:  the size of the grid
+        :param rng:  numpy random generator used for the spread draw
+        :param neighbors:  (row, column) of the neighbors who live in the grid, found with bounds checks if None
+        :return:  the number of people who received the rumor for the first time
+        """
+        location = self.get_location()
+        received = 0
+        if self.heard_rumor and self.generation == 0:
+            if not self.rumor_spread:
+                if rng.random() < self.__sum_of_suspicion:
+                    if neighbors is None:
+                        neighbors = [(location[0] + i, location[1] + j) for i in range(-1, 2) for j in range(-1, 2)
+                                     if 0 <= location[0] + i < n and 0 <= location[1] + j < n and
+                                     not (i == 0 and j == 0) and grid[location[0] + i, location[1] + j] is not None]
+                    for i, j in neighbors:
+                        received += grid[i, j].receive_rumor()
+
+                    grid[location[0], location[1]].rumor_spread = True
+                    grid[location[0], location[1]].start_generation()
+
+                grid[location[0], location[1]].heard_rumor = False
+                grid[location[0], location[1]].__sum_of_suspicion = 0
+            else:
+                grid[location[0], location[1]].rumor_spread = False
+                grid[location[0], location[1]].heard_rumor = False
+                if grid[location[0], location[1]].generation == 0:
+                    grid[location[0], location[1]].__sum_of_suspicion = 0
+                else:
+                    grid[location[0], location[1]].generation -= 1  # decrement generation
+
+        else:
+            if self.heard_rumor and self.generation != 0:
+                self.heard_rumor = False
+                grid[location[0], location[1]].generation -= 1  # decrement generation
+                grid[location[0], location[1]].rumor_spread = False
+                if grid[location[0], location[1]].generation == 0:
+                    grid[location[0], location[1]].__sum_of_suspicion = 0
+            else:
+                grid[location[0], location[1]].rumor_spread = False
+        return received
@@ -0,0 +1,56 @@
+class MilestoneTracker:
+    """
+    keeps the first generation in which the percent of people who received the rumor reached each milestone.
+    the received count is kept up to date by the engine, so an update costs O(1) no matter the grid size.
+    """
+
+    def __init__(self, population, milestones=(25, 50, 75)):
+        """
+        :param population:  number of people in the grid
+        :param milestones:  percents of people who received the rumor to record the generation of
+        """
+        self.population = population
+        self.milestones = sorted(milestones)
+        self.generations = {milestone: None for milestone in self.milestones}
+        self.percent_received = 0
+        # index of the next milestone to reach, milestones are reached in increasing order
+        self.next_milestone = 0
+
+    def update(self, received, generation):
+        """
+        :param received:  number of people who received the rumor
+        :param generation:  current generation
+        """
+        self.percent_received = round(received / self.population * 100, 2)
+        while self.next_milestone < len(self.milestones) and \
+                self.percent_received >= self.milestones[self.next_milestone]:
+            self.generations[self.milestones[self.next_milestone]] = generation
+            self.next_milestone += 1
+
+    def generation_of(self, milestone):
+        """
+        :return:  the generation the milestone was reached in, None if it was not reached (or is not tracked)
+        """
+        return self.generations.get(milestone)
+
+    def reached(self):
+        """
+        :return:  list of (milestone, generation) for every milestone reached so far
+        """
+        return [(milestone, self.generations[milestone]) for milestone in self.milestones[:self.next_milestone]]
+
+    def get_state(self):
+        """
+        :return:  JSON serializable state of the tracker, to keep in a checkpoint
+        """
+        return {'generations': [[milestone, generation] for milestone, generation in self.generations.items()],
+                'next_milestone': self.next_milestone,
+                'percent_received': self.percent_received}
+
+    def set_state(self, state):
+        """
+        :param state:  state returned by get_state
+        """
+        self.generations = {milestone: generation for milestone, generation in state['generations']}
+        self.next_milestone = state['next_milestone']
+        self.percent_received = state['percent_received']
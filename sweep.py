@@ -0,0 +1,260 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from results import ColumnarWriter, ResultsWriter, completed_runs
+from simulation import BatchSimulation, Grid, Simulation, load_layout
+
+
+class SweepSpec:
+    """
+    declarative description of a parameter sweep: every combination of L, P and (S1, S2, S3) is run replicates times
+    """
+
+    def __init__(self, L, P, S, n=100, generation_limit=100, replicates=10, engine="vector", layout="random",
+                 seed=0, layout_cache=None, history=None, history_frames=False):
+        """
+        :param L:  list of L values
+        :param P:  list of population densities
+        :param S:  list of (S1, S2, S3) distributions of suspicion levels
+        :param n:  size of grid
+        :param generation_limit:  generation limit of every run
+        :param replicates:  number of runs of every combination
+        :param engine:  engine of every run, see Simulation. "batch" runs the replicates of every combination together
+                        on a BatchEngine
+        :param layout:  layout of every run, see Simulation
+        :param seed:  root seed of the sweep, the seed of every run is derived from it and the identity of the run. the
+                      layout seed of a random layout is derived from it, n, P, S and the replicate, so the runs that
+                      only differ in L share their layout
+        :param layout_cache:  directory to keep the layouts of the runs in, see Simulation. a random layout is built
+                              once for all the L values. without one, a spiral is still built once per sweep in a
+                              temporary cache
+        :param history:  directory to record the history of every run to, as <run id>.npz. None to not record them
+        :param history_frames:  also record a frame of the state of every generation, see Simulation
+        """
+        self.L = L
+        self.P = P
+        self.S = S
+        self.n = n
+        self.generation_limit = generation_limit
+        self.replicates = replicates
+        self.engine = engine
+        self.layout = layout
+        self.seed = seed
+        self.layout_cache = layout_cache
+        self.history = history
+        self.history_frames = history_frames
+
+    def tasks(self):
+        """
+        :return:  list of (index, entries, options, run id) tasks, entries are the parameters of Simulation and
+                  options its keyword arguments, including the seed of the run
+        """
+        options = {'engine': self.engine, 'layout': self.layout}
+        tasks = []
+        for L in self.L:
+            for P in self.P:
+                for s1, s2, s3 in self.S:
+                    for replicate in range(self.replicates):
+                        entries = [self.n, P, s1, s2, s3, L, self.generation_limit]
+                        identity = run_id(entries, options, replicate, self.seed)
+                        # every run has its own seed, so a run gives the same result in any worker and in any order
+                        task_options = dict(options, seed=int(identity, 16), layout_cache=self.layout_cache)
+                        if self.layout == "random":
+                            # the runs that only differ in L share their layout
+                            task_options['layout_seed'] = int(run_id(entries[:5], {}, replicate, self.seed), 16)
+                        if self.history is not None:
+                            task_options['history'] = os.path.join(self.history, identity + '.npz')
+                            task_options['history_frames'] = self.history_frames
+                        tasks.append((len(tasks), entries, task_options, identity))
+        return tasks
+
+
+def run_id(entries, options, replicate, seed=0):
+    """
+    deterministic identity of a run, the same parameters, replicate and root seed always give the same id
+    :param entries:  parameters of the run
+    :param options:  keyword arguments of the run
+    :param replicate:  number of the replicate of these parameters
+    :param seed:  root seed of the sweep
+    :return:  hex digest identifying the run
+    """
+    key = json.dumps([entries, options, replicate, seed], sort_keys=True)
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def batch_tasks(tasks):
+    """
+    group the tasks of the same parameters into one task that runs them on a BatchEngine
+    :param tasks:  list of (index, entries, options, run id) tasks
+    :return:  list of (index, entries, options, run ids) tasks, options has the seeds and layout seeds of the runs
+              instead of a seed and a layout seed, and the history files of the runs instead of a history file
+    """
+    batches = {}
+    for index, entries, options, identity in tasks:
+        key = json.dumps(entries)
+        if key not in batches:
+            batch_options = {name: value for name, value in options.items()
+                             if name not in ('engine', 'seed', 'layout_seed', 'history')}
+            batch_options['seeds'] = []
+            if 'layout_seed' in options:
+                batch_options['layout_seeds'] = []
+            if 'history' in options:
+                batch_options['histories'] = []
+            batches[key] = (index, entries, batch_options, [])
+        batches[key][2]['seeds'].append(options['seed'])
+        if 'layout_seed' in options:
+            batches[key][2]['layout_seeds'].append(options['layout_seed'])
+        if 'history' in options:
+            batches[key][2]['histories'].append(options['history'])
+        batches[key][3].append(identity)
+    return list(batches.values())
+
+
+def expected_generations(n, p, L, generation_limit):
+    """
+    rough number of generations a run that stops early lasts, from runs of the vector engine: a full grid stops once
+    everyone received the rumor, after about 0.65 n generations, and in a grid with P below 0.6 people who wait 3 or
+    more generations between spreads let the rumor die out after about 30. the other runs mostly reach the limit
+    :param n:  size of grid
+    :param p:  population density
+    :param L:  L parameter
+    :param generation_limit:  generation limit of the run
+    :return:  expected number of generations of the run
+    """
+    if p >= 1:
+        return min(generation_limit, 0.65 * n)
+    if p < 0.6 and L >= 3:
+        return min(generation_limit, 30)
+    return generation_limit
+
+
+def estimate_cost(entries, options):
+    """
+    rough proxy of the relative run time of a task, only used to start the longest tasks first
+    :param entries:  parameters of the run
+    :param options:  keyword arguments of the run
+    :return:  number of cells or people the run visits in the generations it is expected to last
+    """
+    n, p, L, generation_limit = entries[0], entries[1], entries[5], entries[6]
+    # the vector and compiled engines and the batches, which have seeds instead of an engine, visit every cell of the
+    # grid, the object, frontier and graph engines only the people
+    whole_grid = 'seeds' in options or options.get('engine', 'object') in ('vector', 'compiled')
+    cells = n * n if whole_grid else n * n * p
+    generations = expected_generations(n, p, L, generation_limit) if options.get('stop_early', True) else \
+        generation_limit
+    return cells * generations * len(options.get('seeds', [None]))
+
+
+def run_task(task):
+    """
+    run one task of a sweep in a worker process
+    :param task:  (index, entries, options, run id), or (index, entries, options, run ids) of a batch
+    :return:  (index, list of the stats of the runs)
+    """
+    index, entries, options, identity = task
+    if 'seeds' in options:
+        rows = BatchSimulation(entries, **options).run()
+        identities = identity
+    else:
+        rows = [Simulation(entries, **options).run()]
+        identities = [identity]
+    for stats, identity in zip(rows, identities):
+        stats['run id'] = identity
+    return index, rows
+
+
+class Progress:
+    """
+    reports how many runs of a sweep are done and an estimate of the time left
+    """
+
+    def __init__(self, costs, runs, report_every=5):
+        """
+        :param costs:  estimated cost of every task, by index
+        :param runs:  number of runs of all the tasks
+        :param report_every:  seconds between two reports
+        """
+        self.costs = costs
+        self.runs = runs
+        self.total_cost = sum(costs.values())
+        self.done_cost = 0
+        self.done = 0
+        self.report_every = report_every
+        self.start = time.time()
+        self.last_report = self.start
+
+    def update(self, index, runs=1):
+        """
+        :param index:  index of the task that finished
+        :param runs:  number of runs the task did
+        """
+        self.done += runs
+        self.done_cost += self.costs[index]
+        now = time.time()
+        if now - self.last_report >= self.report_every or self.done == self.runs:
+            self.last_report = now
+            print(self.report(now))
+
+    def report(self, now):
+        elapsed = now - self.start
+        # the time left is estimated from the cost of the tasks done, not their number, the expensive ones go first
+        remaining = elapsed * (self.total_cost - self.done_cost) / self.done_cost if self.done_cost else 0
+        return "runs done: " + str(self.done) + "/" + str(self.runs) + ", elapsed: " + \
+            str(round(elapsed)) + "s, ETA: " + str(round(remaining)) + "s"
+
+
+def run_sweep(spec, path='stats.csv', processes=None, chunksize=None, report_every=5):
+    """
+    run every task of a sweep on a pool of processes and write the stats of the runs to the stats file.
+    the ids of the runs written to the stats file are kept in an index next to it, so running an interrupted sweep
+    again only runs what is missing.
+    :param spec:  SweepSpec of the sweep
+    :param path:  stats file, a .csv file or else the directory of a columnar results store, the index is
+                  path + '.index'
+    :param processes:  number of worker processes, by default the number of cores
+    :param chunksize:  number of tasks a worker takes at a time, by default about 4 chunks per worker
+    :param report_every:  seconds between two progress reports
+    """
+    index_path = path + '.index'
+    done = completed_runs(index_path)
+    all_tasks = spec.tasks()
+    tasks = [task for task in all_tasks if task[3] not in done]
+    if len(tasks) < len(all_tasks):
+        print("skipping " + str(len(all_tasks) - len(tasks)) + " runs already in " + path)
+    runs = len(tasks)
+    if spec.engine == "batch":
+        tasks = batch_tasks(tasks)
+    costs = {task[0]: estimate_cost(task[1], task[2]) for task in tasks}
+    # longest tasks first, so a slow configuration doesn't start last and keep one worker busy while others idle
+    tasks.sort(key=lambda task: costs[task[0]], reverse=True)
+    processes = processes or multiprocessing.cpu_count()
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (processes * 4))
+
+    if spec.history is not None:
+        os.makedirs(spec.history, exist_ok=True)
+    temporary = None
+    if spec.layout == "spiral" and tasks:
+        if spec.layout_cache is None:
+            # without a layout cache the spiral goes to a cache of the sweep, removed when the sweep ends
+            temporary = tempfile.TemporaryDirectory(prefix='layouts_')
+            for task in tasks:
+                task[2]['layout_cache'] = temporary.name
+        # the spiral only depends on n, cache it once here instead of in every worker
+        load_layout(Grid(spec.n, spec.P[0], *spec.S[0]), "spiral", spec.L[0], cache_dir=tasks[0][2]['layout_cache'],
+                    people=False)
+    progress = Progress(costs, runs, report_every)
+    writer = ResultsWriter if path.endswith('.csv') else ColumnarWriter
+    # the workers return the stats of every run, only this process writes them to the stats file
+    try:
+        with multiprocessing.Pool(processes) as pool, writer(path, index_path=index_path) as results:
+            for index, rows in pool.imap_unordered(run_task, tasks, chunksize):
+                for stats in rows:
+                    results.add(stats)
+                progress.update(index, len(rows))
+    finally:
+        if temporary is not None:
+            temporary.cleanup()
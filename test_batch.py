@@ -0,0 +1,18 @@
+import pytest
+
+from simulation import BatchSimulation, Simulation
+
+
+@pytest.mark.parametrize('layout', ['random', 'spiral'])
+@pytest.mark.parametrize('L', [0, 3])
+def test_replicates_match_single_runs(layout, L):
+    params = [30, 0.8, 0.3, 0.3, 0.2, L, 60]
+    seeds = [0, 1, 2, 3]
+    batch = BatchSimulation(params, seeds, layout=layout).run()
+    for seed, stats in zip(seeds, batch):
+        assert stats == Simulation(params, engine="vector", layout=layout, seed=seed).run()
+
+
+def test_batch_is_not_a_simulation_engine():
+    with pytest.raises(ValueError):
+        Simulation([10, 1, 0.3, 0.3, 0.2, 2, 10], engine="batch", seed=1)
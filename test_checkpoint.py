@@ -0,0 +1,52 @@
+import pytest
+
+from checkpoint import save_checkpoint
+from simulation import Simulation
+
+PARAMS = [40, 0.8, 0.3, 0.3, 0.2, 2, 80]
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupt_at(generation):
+    """
+    :return:  progress function of skip_to_end that kills the run once it reaches the generation
+    """
+    def progress(reached):
+        if reached == generation:
+            raise Interrupted
+    return progress
+
+
+@pytest.mark.parametrize('engine', ['vector', 'frontier', 'compiled', 'graph'])
+def test_resumed_run_matches_uninterrupted_run(tmp_path, engine):
+    expected = Simulation(PARAMS, engine=engine, seed=7).run()
+    simulation = Simulation(PARAMS, engine=engine, seed=7, checkpoint=str(tmp_path), checkpoint_every=10)
+    simulation.spread_rumor()
+    with pytest.raises(Interrupted):
+        simulation.skip_to_end(interrupt_at(25))
+    # the run without a seed takes the seed of the checkpoint
+    resumed = Simulation(PARAMS, engine=engine, checkpoint=str(tmp_path))
+    assert resumed.engine.generation == 20
+    assert resumed.run() == expected
+
+
+def test_finished_run_resumes_with_its_stats(tmp_path):
+    expected = Simulation(PARAMS, engine="vector", seed=7, checkpoint=str(tmp_path)).run()
+    assert Simulation(PARAMS, engine="vector", seed=7, checkpoint=str(tmp_path)).run() == expected
+
+
+def test_checkpoint_of_another_run_is_rejected(tmp_path):
+    Simulation(PARAMS, engine="vector", seed=7, checkpoint=str(tmp_path)).run()
+    with pytest.raises(ValueError):
+        Simulation(PARAMS, engine="vector", seed=8, checkpoint=str(tmp_path))
+    with pytest.raises(ValueError):
+        Simulation(PARAMS[:5] + [3, 80], engine="vector", seed=7, checkpoint=str(tmp_path))
+
+
+def test_checkpoint_without_simulation_state_is_rejected(tmp_path):
+    save_checkpoint(Simulation(PARAMS, engine="vector", seed=7).engine, str(tmp_path))
+    with pytest.raises(ValueError):
+        Simulation(PARAMS, engine="vector", seed=7, checkpoint=str(tmp_path))
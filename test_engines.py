@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from engine import CompiledEngine, FrontierEngine, GraphEngine, VectorEngine
+from simulation import Grid
+
+
+class CellDraws:
+    """
+    fake generator that draws the same number for a cell however an engine asks for it: the whole padded grid, the
+    active cells of a frontier, or one number per person in processing order. a draw without a shape, the draw of a
+    rumor starter, is 0 so the starters always spread.
+    """
+
+    def __init__(self, n, rows, cols, generations, seed):
+        """
+        :param n:  size of grid
+        :param rows:  row of every person, in processing order
+        :param cols:  column of every person, in processing order
+        :param generations:  number of generations to draw for
+        :param seed:  seed of the numbers
+        """
+        self.rows = rows
+        self.cols = cols
+        # one padded grid of numbers per generation, the padding is never read
+        self.values = np.zeros((generations, n + 2, n + 2))
+        self.values[:, 1:-1, 1:-1] = np.random.default_rng(seed).random((generations, n, n))
+        self.generation = 0
+        self.engine = None
+
+    def random(self, size=None, out=None):
+        if out is not None:
+            out[...] = self.values[self.generation]
+            return out
+        if size is None:
+            return 0.0
+        if isinstance(self.engine, GraphEngine):
+            return self.values[self.generation, self.rows + 1, self.cols + 1]
+        return self.values[self.generation].ravel()[self.engine.active]
+
+    def cell(self, i, j):
+        """
+        :return:  generator of the one draw Person.spread makes for the person in cell (i, j)
+        """
+        return Constant(self.values[self.generation, i + 1, j + 1])
+
+
+class Constant:
+    def __init__(self, value):
+        self.value = value
+
+    def random(self):
+        return self.value
+
+
+def object_step(grid, draws):
+    """
+    advance the Person objects of a grid by one generation, as Simulation.next_generation does
+    """
+    back_grid = grid.back_buffer()
+    for i, j in grid.people_coords:
+        back_grid[i, j].copy_state(grid.people_grid[i, j])
+    for (i, j), neighbors in zip(grid.people_coords, grid.neighbor_cells()):
+        grid.received_count += grid.people_grid[i, j].spread(back_grid, grid.n, draws.cell(i, j), neighbors)
+    grid.swap_buffers()
+
+
+@pytest.mark.parametrize('engine_class', [VectorEngine, FrontierEngine, CompiledEngine, GraphEngine])
+@pytest.mark.parametrize('layout', ['random', 'spiral'])
+@pytest.mark.parametrize('L', [0, 1, 3])
+def test_engine_matches_person_objects(engine_class, layout, L, n=30, generations=40):
+    for seed in range(3):
+        grid = Grid(n, 0.8, 0.3, 0.3, 0.2, np.random.default_rng(seed))
+        grid.create_layout(layout, L)
+        grid.create_rumor_spreader()
+        draws = CellDraws(n, grid.rows, grid.cols, generations, seed)
+        engine = engine_class.from_grid(grid, L, draws)
+        draws.engine = engine
+        grid.spread_rumor(Constant(0.0))
+        engine.spread_rumor()
+        # the graph engine keeps its state per person in processing order, the grid engines per padded cell
+        if engine_class is GraphEngine:
+            cells = np.arange(len(grid.rows))
+        else:
+            cells = (grid.rows + 1, grid.cols + 1)
+        for generation in range(generations):
+            draws.generation = generation
+            object_step(grid, draws)
+            engine.step()
+            people = [grid.people_grid[i, j] for i, j in grid.people_coords]
+            expected = {'heard_rumor': [person.heard_rumor for person in people],
+                        'rumor_received': [person.rumor_received for person in people],
+                        'rumor_spread': [person.rumor_spread for person in people],
+                        'cooldown': [person.generation for person in people],
+                        'sum_of_suspicion': [person.get_sum_of_suspicion() for person in people]}
+            for name, values in expected.items():
+                np.testing.assert_allclose(getattr(engine, name)[cells], values, atol=1e-9,
+                                           err_msg=name + ' in generation ' + str(generation) + ', seed ' + str(seed))
+            assert engine.received == grid.received_count
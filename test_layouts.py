@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from layouts import spiral_path
+from simulation import Grid
+
+# the step of every direction of the spiral and the direction it turns into
+TURNS = {'right': ((0, 1), 'down'), 'down': ((1, 0), 'left'), 'left': ((0, -1), 'up'), 'up': ((-1, 0), 'right')}
+
+
+def loop_spiral(x, y, length, direction):
+    """
+    the walk of the original Grid.spiral_grid of part 2, cell by cell
+    :return:  (walk, people) the cells it walks through and the cells it puts an S4 person in, in walking order
+    """
+    walk, people = [], []
+    while length > 0:
+        for k in range(length):
+            walk.append((x, y))
+            if len(walk) % 2:
+                people.append((x, y))
+            (dx, dy), turn = TURNS[direction]
+            if k == length - 1:
+                direction = turn
+                (dx, dy), _ = TURNS[direction]
+                length -= 2
+            x, y = x + dx, y + dy
+    return walk, people
+
+
+@pytest.mark.parametrize('n', [1, 2, 5, 10, 11, 100])
+def test_spiral_path_matches_the_loop(n):
+    walk, _ = loop_spiral(0, 0, n, "right")
+    assert [tuple(cell) for cell in spiral_path(0, 0, n, "right").tolist()] == walk
+
+
+@pytest.mark.parametrize('n', [5, 10, 11, 100])
+def test_spiral_grid_matches_the_loop(n):
+    walk, people = loop_spiral(0, 0, n, "right")
+    grid = Grid(n, 1, 0.3, 0.3, 0.2, np.random.default_rng(0))
+    grid.create_layout("spiral", 2)
+    # the spiral people come first, in walking order, then fill_grid puts S1, S2 and S3 in turn into the cells the
+    # spiral did not walk through, row by row
+    walked = set(walk)
+    rest = [(i, j) for i in range(n) for j in range(n) if (i, j) not in walked]
+    assert list(zip(grid.rows.tolist(), grid.cols.tolist())) == people + rest
+    assert grid.groups.tolist() == [4] * len(people) + [1 + k % 3 for k in range(len(rest))]
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from aggregate import grouped_stats
+from results import ColumnarWriter, ResultsWriter, load_results
+
+# a seed too large for int64, like the entropy of a fresh SeedSequence
+BIG_SEED = 2 ** 100 + 1
+ROWS = [{'L value': 3, 'P value': 0.8, '75 percentile': 40, 'final percentile': 90.0, 'seed': BIG_SEED, 'run id': 'a'},
+        {'L value': 3, 'P value': 0.8, '75 percentile': None, 'final percentile': 60.0, 'seed': 5, 'run id': 'b'},
+        {'L value': 3, 'P value': 0.8, '75 percentile': 50, 'final percentile': 95.0, 'seed': 6, 'run id': 'c'},
+        {'L value': 5, 'P value': 0.8, '75 percentile': None, 'final percentile': 20.0, 'seed': 7, 'run id': 'd'}]
+
+
+@pytest.mark.parametrize('name, writer', [('stats.csv', ResultsWriter), ('stats', ColumnarWriter)])
+def test_load_results_keeps_nulls_and_text_seeds(tmp_path, name, writer):
+    path = str(tmp_path / name)
+    with writer(path) as results:
+        for row in ROWS:
+            results.add(row)
+    table = load_results(path)
+    assert table['75 percentile'].mask.tolist() == [False, True, False, True]
+    assert table['75 percentile'].compressed().tolist() == [40, 50]
+    assert table['seed'].tolist() == [str(BIG_SEED), '5', '6', '7']
+
+
+def test_load_results_masks_columns_a_part_lacks(tmp_path):
+    path = str(tmp_path / 'stats')
+    with ColumnarWriter(path) as results:
+        results.add({'L value': 3, 'final percentile': 90.0, 'run id': 'a'})
+    with ColumnarWriter(path) as results:
+        results.add({'L value': 5, 'final percentile': 80.0, '90 percentile': 70, 'run id': 'b'})
+    table = load_results(path)
+    assert table['L value'].tolist() == [3, 5]
+    assert table['90 percentile'].mask.tolist() == [True, False]
+
+
+def test_grouped_stats_leave_out_missing_milestones():
+    table = {'L value': np.ma.masked_array([3, 3, 3, 5]),
+             '75 percentile': np.ma.masked_array([40, 0, 50, 0], mask=[False, True, False, True])}
+    result = grouped_stats(table, ['L value'], ['75 percentile'])
+    assert result['L value'].tolist() == [3, 5]
+    assert result['runs'].tolist() == [3, 1]
+    assert result['75 percentile mean'][0] == 45
+    assert result['75 percentile median'][0] == 45
+    assert result['75 percentile count'].tolist() == [2, 0]
+    assert result['75 percentile reached'][0] == pytest.approx(2 / 3)
+    assert np.isnan(result['75 percentile mean'][1]) and np.isnan(result['75 percentile median'][1])
@@ -0,0 +1,28 @@
+import csv
+
+from results import completed_runs
+from sweep import SweepSpec, run_sweep
+
+
+def sweep_spec():
+    return SweepSpec([0, 3], [0.6, 1], [(0.3, 0.3, 0.2)], n=20, generation_limit=20, replicates=2)
+
+
+def read_rows(path):
+    with open(path, newline='') as file:
+        return list(csv.DictReader(file))
+
+
+def test_sweep_runs_only_the_runs_missing_from_its_index(tmp_path):
+    path = str(tmp_path / 'stats.csv')
+    identities = [task[3] for task in sweep_spec().tasks()]
+    # a sweep killed after writing the first half of its runs
+    with open(path + '.index', 'w') as index:
+        index.writelines(identity + '\n' for identity in identities[:4])
+    run_sweep(sweep_spec(), path, processes=2)
+    assert sorted(row['run id'] for row in read_rows(path)) == sorted(identities[4:])
+    assert completed_runs(path + '.index') == set(identities)
+    # running the finished sweep again runs nothing
+    run_sweep(sweep_spec(), path, processes=2)
+    assert len(read_rows(path)) == 4
+
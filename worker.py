@@ -0,0 +1,119 @@
+import queue
+import threading
+
+from rendering import visual_state
+
+
+class SimulationWorker(threading.Thread):
+    """
+    runs a simulation in a background thread for the GUI, which only draws. after every generation the worker puts a
+    frame with how every cell looks and the stats into a bounded queue, and waits while the queue is full, so it never
+    runs more than a few frames ahead of the window. skip() stops the frames and runs the simulation to the end at full
+    speed, without drawing anything, and puts a last frame of the final generation. step() pauses the simulation and
+    runs one generation every time it is called.
+    """
+
+    def __init__(self, simulation, max_frames=4, start_delay=0):
+        """
+        :param simulation:  the Simulation to run, only the worker touches it once started
+        :param max_frames:  number of frames the queue holds
+        :param start_delay:  seconds to show the first generation for before the rumor is spread
+        """
+        super().__init__(daemon=True)
+        self.simulation = simulation
+        self.frames = queue.Queue(max_frames)
+        self.start_delay = start_delay
+        self.skipping = threading.Event()
+        self.stopping = threading.Event()
+        # set by skip() and stop(), so the start delay is cut short
+        self.interrupted = threading.Event()
+        # once paused, the worker only runs a generation for every step requested
+        self.paused = threading.Event()
+        self.steps = threading.Semaphore(0)
+        # generation the simulation reached, the window shows it as the progress of a skip
+        self.generation = 0
+
+    def frame(self):
+        """
+        :return:  frame of the current generation, a dictionary of its generation, how every cell looks, the percent
+                  of people who received the rumor and the (milestone, generation) of every milestone reached
+        """
+        self.simulation.update_stats()
+        return {'generation': self.simulation.grid.generation,
+                'visual': visual_state(self.simulation.cell_state()),
+                'percent received': self.simulation.percent_received,
+                'milestones': list(self.simulation.milestones.reached())}
+
+    def put(self, frame):
+        """
+        wait for room in the queue, unless the worker is told to skip or stop
+        :return:  True if the frame was put in the queue
+        """
+        while not (self.skipping.is_set() or self.stopping.is_set()):
+            try:
+                self.frames.put(frame, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def run(self):
+        simulation = self.simulation
+        self.put(self.frame())
+        self.interrupted.wait(self.start_delay)
+        if self.stopping.is_set():
+            return
+        simulation.spread_rumor()
+        self.put(self.frame())
+        while simulation.grid.generation < simulation.generation_limit and not self.skipping.is_set():
+            if self.stopping.is_set():
+                return
+            if self.paused.is_set() and not self.steps.acquire(timeout=0.1):
+                continue
+            simulation.next_generation()
+            self.put(self.frame())
+        if self.skipping.is_set() and not self.stopping.is_set():
+            simulation.skip_to_end(self.report)
+            # drop the frames the window did not show yet, the last frame replaces them
+            self.latest()
+            self.frames.put(self.frame())
+
+    def report(self, generation):
+        """
+        :param generation:  generation the simulation reached while skipping to the end
+        """
+        self.generation = generation
+
+    def skip(self):
+        """
+        stop putting frames in the queue and run the simulation to the end
+        """
+        self.generation = self.simulation.grid.generation
+        self.skipping.set()
+        self.interrupted.set()
+
+    def step(self):
+        """
+        pause the simulation and run its next generation
+        """
+        self.paused.set()
+        self.steps.release()
+
+    def stop(self):
+        """
+        stop the simulation, the thread ends after the generation it is running
+        """
+        self.stopping.set()
+        self.interrupted.set()
+
+    def latest(self):
+        """
+        :return:  the newest frame in the queue and drop the older ones, which the window is too slow to show, None if
+                  the queue is empty
+        """
+        frame = None
+        while True:
+            try:
+                frame = self.frames.get_nowait()
+            except queue.Empty:
+                return frame